@@ -1 +1,7 @@
-from .api_client import get_mod_files, get_download_link, get_category_name, get_mod_details, get_file_details, get_tracked_mods
+from .connectivity import OfflineError, is_online, probe
+from .rate_limit import request_priority, INTERACTIVE, BACKGROUND
+from .session import get_session, api_get, download_get
+from .cache import cached_get_json, share_in_flight
+from .bulk import iter_bulk, run_bulk
+from .api_client import get_mod_files, get_download_link, get_category_name, get_mod_details, get_file_details, get_tracked_mods, \
+    get_updated_mods, prefetch_download
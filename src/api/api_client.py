@@ -1,19 +1,31 @@
-import requests
+import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from urllib.parse import urlparse, parse_qs
+
+import requests
 
 from src.config import Config
+from src.api.session import api_get
+from src.api.cache import cached_get_json, share_in_flight
+from src.api.bulk import run_bulk
 
 logger = logging.getLogger(__name__)
 
+# Download link URL -> (link, time after which it is fetched again)
+_download_links = {}
+_download_links_lock = threading.Lock()
 
-def get_mod_files(game, mod_id):
-    """Fetch all files for a specified mod and log file IDs."""
+
+def get_mod_files(game, mod_id, max_age=None, raise_errors=False):
+    """
+    Fetch all files for a specified mod and log file IDs.
+    A cached list is reused while it is younger than `max_age` seconds (the endpoint's TTL by default).
+    With `raise_errors`, a failed request raises instead of returning an empty (or expired cached) list.
+    """
     url = f"{Config.BASE_URL}/games/{game}/mods/{mod_id}/files.json"
     try:
-        response = requests.get(url, headers=Config.HEADERS)
-        response.raise_for_status()
-        data = response.json()
+        data = cached_get_json(url, "mod_files", max_age, allow_stale=not raise_errors)
 
         # Extract files and ensure file IDs are integers
         files = data.get("files", [])
@@ -28,14 +40,14 @@ def get_mod_files(game, mod_id):
         return files
     except requests.RequestException as e:
         logging.error(f"Failed to fetch mod files for mod ID {mod_id}: {e}")
+        if raise_errors:
+            raise
         return []
 
 def get_mod_details(game, mod_id):
     url = f"{Config.BASE_URL}/games/{game}/mods/{mod_id}.json"
     try:
-        response = requests.get(url, headers=Config.HEADERS)
-        response.raise_for_status()
-        mod_details = response.json()
+        mod_details = cached_get_json(url, "mod_details")
         mod_details["category"] = get_category_name(mod_details.get("category_id"))
         return mod_details
     except requests.RequestException as e:
@@ -46,24 +58,49 @@ def get_file_details(game, mod_id, file_id):
     """Retrieve detailed information about a specific file."""
     url = f"{Config.BASE_URL}/games/{game}/mods/{mod_id}/files/{file_id}.json"
     try:
-        response = requests.get(url, headers=Config.HEADERS)
-        response.raise_for_status()
-        return response.json()  # Returns detailed file information
+        return cached_get_json(url, "file_details")  # Returns detailed file information
     except requests.RequestException as e:
         logging.error(f"Failed to fetch details for file ID {file_id}: {e}")
         return None
 
+def get_updated_mods(game, period):
+    """
+    Fetch the mods of a game updated within `period` ("1d", "1w" or "1m").
+    Returns a list of `{"mod_id", "latest_file_update", "latest_mod_activity"}` dicts, or None on failure.
+    """
+    url = f"{Config.BASE_URL}/games/{game}/mods/updated.json"
+    try:
+        response = api_get(url, "updated_mods", params={"period": period})
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        logging.error(f"Failed to fetch mods updated in the last {period}: {e}")
+        return None
+
 def get_download_link(game, mod_id, file_id):
-    """Generate a download link for a specific mod file."""
+    """
+    Generate a download link for a specific mod file.
+    Links are cached until shortly before they expire, and concurrent calls for the same file share one request.
+    """
     url = f"{Config.BASE_URL}/games/{game}/mods/{mod_id}/files/{file_id}/download_link.json"
+    with _download_links_lock:
+        link, expires_at = _download_links.get(url, (None, 0))
+    if link and time.time() < expires_at:
+        return link
+    return share_in_flight(url, lambda: _fetch_download_link(url, file_id))
+
+def _fetch_download_link(url, file_id):
     try:
-        response = requests.get(url, headers=Config.HEADERS)
+        response = api_get(url, "download_link")
         response.raise_for_status()
         data = response.json()
 
         # Premium users get a direct download link as a list
         if isinstance(data, list) and data:
-            return data[0]['URI']  # Extract the URI field for the first download link
+            link = data[0]['URI']  # Extract the URI field for the first download link
+            with _download_links_lock:
+                _download_links[url] = (link, _link_expiry(link))
+            return link
 
         # For non-premium users, display a message and provide instructions
         if "error" in data and data["error"] == "You don't have permission to get download links":
@@ -74,23 +111,37 @@ def get_download_link(game, mod_id, file_id):
         logging.error(f"Failed to get download link for file ID {file_id}: {e}")
         return None
 
+def _link_expiry(link):
+    """Return when a cached link should stop being used: a margin before its `expires` parameter, if it has one."""
+    try:
+        expires = int(parse_qs(urlparse(link).query)["expires"][0])
+    except (KeyError, IndexError, ValueError):
+        return time.time() + Config.DOWNLOAD_LINK_TTL
+    return expires - Config.DOWNLOAD_LINK_EXPIRY_MARGIN
+
+def prefetch_download(game, mod_id, file_id):
+    """Resolve everything a download needs before its transfer starts, so it is served from the caches then."""
+    get_mod_details(game, mod_id)
+    get_mod_files(game, mod_id)
+    get_file_details(game, mod_id, file_id)
+    get_download_link(game, mod_id, file_id)
+
 def get_category_name(category_id):
     return Config.CATEGORY_MAPPING.get(category_id, "Unknown Category")
 
-def get_tracked_mods(game="cyberpunk2077"):
-    """Fetch tracked mods and their details concurrently using ThreadPoolExecutor."""
+def get_tracked_mods(game="cyberpunk2077", on_mod=None, cancel_event=None):
+    """
+    Fetch tracked mods and their details concurrently with the bulk engine.
+    `on_mod(mod_details)` is called as each mod arrives; setting `cancel_event` stops the sync early
+    and returns the mods fetched so far.
+    """
     url = f"{Config.BASE_URL}/user/tracked_mods.json"
     try:
-        response = requests.get(url, headers=Config.HEADERS)
+        response = api_get(url, "tracked_mods")
         response.raise_for_status()
         tracked_mods = response.json()
 
-        def fetch_mod(mod):
-            mod_id = mod.get("mod_id")
-            if not mod_id:
-                logging.warning("Skipping mod with no ID.")
-                return None
-
+        def fetch_mod(mod_id):
             # Fetch mod details; if unavailable, create a default dict.
             detailed_mod = get_mod_details(game, mod_id)
             if not detailed_mod:
@@ -100,19 +151,17 @@ def get_tracked_mods(game="cyberpunk2077"):
                     "category": "Uncategorized",
                 }
 
-            # Fetch file details (this is optional; adjust based on your needs)
-            files = get_mod_files(game, mod_id)
+            # File lists are fetched on demand by `get_mod_files`, which keeps them in the response cache
             logging.info(f"Fetched data for mod ID {mod_id}.")
             return detailed_mod
 
-        detailed_mods = []
-        # Use ThreadPoolExecutor to fetch each mod's details concurrently.
-        with ThreadPoolExecutor() as executor:
-            futures = {executor.submit(fetch_mod, mod): mod for mod in tracked_mods}
-            for future in as_completed(futures):
-                result = future.result()
-                if result is not None:
-                    detailed_mods.append(result)
+        mod_ids = [mod.get("mod_id") for mod in tracked_mods if mod.get("mod_id")]
+        if len(mod_ids) < len(tracked_mods):
+            logging.warning(f"Skipping {len(tracked_mods) - len(mod_ids)} tracked mods with no ID.")
+
+        on_result = (lambda _, mod: on_mod(mod)) if on_mod else None
+        results, _ = run_bulk(mod_ids, fetch_mod, on_result=on_result, cancel_event=cancel_event)
+        detailed_mods = [mod for _, mod in results]
 
         logging.info("Finished fetching tracked mods.")
         return detailed_mods
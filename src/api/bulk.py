@@ -0,0 +1,59 @@
+import asyncio
+import logging
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the cancel event while waiting for results
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+async def iter_bulk(items, fetch, limit=None, cancel_event=None):
+    """
+    Run the blocking `fetch(item)` for every item with at most `limit` calls in flight, yielding
+    `(item, result, error)` as each one finishes. Setting `cancel_event` (a `threading.Event`) stops
+    the run: queued calls never start and the results of calls still in flight are dropped.
+    """
+    semaphore = asyncio.Semaphore(limit or Config.API_WORKERS)
+
+    async def run(item):
+        async with semaphore:
+            return await asyncio.to_thread(fetch, item)
+
+    tasks = {asyncio.create_task(run(item)): item for item in items}
+    pending = set(tasks)
+    try:
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                logging.info(f"Bulk request cancelled with {len(pending)} of {len(tasks)} items left.")
+                break
+
+            done, pending = await asyncio.wait(pending, timeout=_CANCEL_POLL_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                yield tasks[task], None if error else task.result(), error
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+def run_bulk(items, fetch, on_result=None, cancel_event=None, limit=None):
+    """
+    Synchronous wrapper around `iter_bulk` for Tk handlers and worker threads.
+    `on_result(item, result)` is called as each result arrives; failures are logged and skipped.
+    Returns `(results, errors)` as lists of `(item, result)` and `(item, error)` pairs in completion order.
+    """
+    async def consume():
+        results, errors = [], []
+        async for item, result, error in iter_bulk(items, fetch, limit, cancel_event):
+            if error is not None:
+                logging.error(f"❌ Bulk request failed for {item}: {error}")
+                errors.append((item, error))
+                continue
+            results.append((item, result))
+            if on_result:
+                on_result(item, result)
+        return results, errors
+
+    return asyncio.run(consume())
@@ -0,0 +1,104 @@
+import copy
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+import requests
+
+from src.config import Config
+from src.api.session import api_get
+from src.storage import database
+
+logger = logging.getLogger(__name__)
+
+# Request key (usually the URL) -> Future of the call currently fetching it, shared by every concurrent caller
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def cached_get_json(url, endpoint, max_age=None, allow_stale=True):
+    """
+    GET a JSON API endpoint through the response cache (see `_fetch_json`). `endpoint` names the entry
+    of `Config.HTTP_CACHE_TTL` and `Config.HTTP_TIMEOUTS` to use; `max_age` overrides the TTL.
+    With `allow_stale=False` a failed request raises instead of falling back to an expired entry.
+    Concurrent calls for the same URL share a single request.
+    """
+    ttl = Config.HTTP_CACHE_TTL[endpoint] if max_age is None else max_age
+    allow_stale = allow_stale and ttl != 0
+    # Callers that refuse stale data don't share a request with callers that would accept it
+    return share_in_flight((url, allow_stale), lambda: _fetch_json(url, endpoint, ttl, allow_stale))
+
+def share_in_flight(key, fetch):
+    """
+    Run `fetch()` unless a call for the same key is already running, in which case wait for its result.
+    Each caller gets its own copy of the result.
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        owner = future is None
+        if owner:
+            future = _in_flight[key] = Future()
+
+    if not owner:
+        return copy.deepcopy(future.result())
+
+    try:
+        data = fetch()
+        future.set_result(data)
+        return copy.deepcopy(data)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+
+def _fetch_json(url, endpoint, ttl, allow_stale=True):
+    """
+    Read a JSON API endpoint through the on-disk response cache.
+    Fresh entries (younger than `ttl` seconds) are served without a request; stale entries are revalidated
+    with If-None-Match / If-Modified-Since, so an unchanged resource only costs a 304.
+    When the request fails (including in offline mode) a cached copy is served however old it is, unless the
+    caller forced revalidation (`ttl` of 0) or passed `allow_stale=False`; then, or without a cached copy,
+    the `requests.RequestException` is raised like for a plain request.
+    """
+    now = time.time()
+    cached = database.load_http_response(url)
+
+    if cached and now - cached["fetched_at"] < ttl:
+        database.touch_http_response(url, now)
+        return json.loads(cached["body"])
+
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = api_get(url, endpoint, headers=headers)
+        if response.status_code != 304 or not cached:
+            response.raise_for_status()
+    except requests.RequestException as e:
+        if not cached or not allow_stale or ttl == 0:
+            raise
+        logging.warning(f"Serving cached response for {url} after the request failed: {e}")
+        return json.loads(cached["body"])
+
+    if response.status_code == 304 and cached:
+        logging.debug(f"Cached response for {url} is still valid.")
+        database.touch_http_response(url, now, fetched_at=now)
+        return json.loads(cached["body"])
+
+    data = response.json()
+    database.save_http_response(
+        url,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+        response.text,
+        now,
+        Config.HTTP_CACHE_MAX_ENTRIES,
+    )
+    return data
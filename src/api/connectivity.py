@@ -0,0 +1,58 @@
+import time
+import socket
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_offline = False
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+class OfflineError(requests.ConnectionError):
+    """Raised instead of sending a request while the app is in offline mode."""
+
+
+def is_online():
+    """
+    Return False while the app is in offline mode. Once `CONNECTIVITY_RETRY_INTERVAL` has passed since
+    the last probe, the connection is probed again so the app goes back online on its own.
+    """
+    with _lock:
+        if not _offline:
+            return True
+        if time.time() - _checked_at < Config.CONNECTIVITY_RETRY_INTERVAL:
+            return False
+    return probe()
+
+def probe():
+    """Open a TCP connection to the API host and switch offline mode on or off depending on the result."""
+    global _offline, _checked_at
+    url = urlparse(Config.BASE_URL)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    try:
+        socket.create_connection((url.hostname, port), timeout=Config.CONNECTIVITY_PROBE_TIMEOUT).close()
+        online = True
+    except OSError:
+        online = False
+
+    with _lock:
+        if online and _offline:
+            logging.info("🔌 Connection to the Nexus API restored.")
+        elif not online and not _offline:
+            logging.warning("🔌 Can't reach the Nexus API. Working offline from local caches.")
+        _offline, _checked_at = not online, time.time()
+    return online
+
+def report_connection_failure():
+    """Probe the connection after a request failed to connect or timed out, unless it was just probed."""
+    with _lock:
+        if _offline or time.time() - _checked_at < Config.CONNECTIVITY_PROBE_TIMEOUT:
+            return
+    probe()
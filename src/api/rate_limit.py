@@ -0,0 +1,161 @@
+import time
+import random
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Request priorities: interactive requests are made on behalf of a user action, background ones are not
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_condition = threading.Condition()
+_local = threading.local()
+
+_active = 0                  # Requests currently in flight
+_interactive_waiting = 0     # Interactive requests waiting for a slot
+_remaining = None            # Requests left in the current quota window, as reported by the API
+_reset_at = None             # Epoch at which that window resets
+_paused_until = 0.0          # Epoch until which every request waits after a 429
+_next_background_slot = 0.0  # Epoch at which the next background request may start
+
+
+@contextmanager
+def request_priority(priority):
+    """Run the API requests made by the current thread inside the block at the given priority."""
+    previous = getattr(_local, "priority", INTERACTIVE)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+def send(request):
+    """
+    Run `request()` (which performs a single API call and returns its response) under the quota scheduler.
+    Concurrency shrinks as the remaining quota runs low, background requests are spread over what is left
+    of the quota window and stop entirely before the reserve kept for interactive requests, and a 429 pauses
+    every request for a jittered backoff before being retried.
+    """
+    priority = getattr(_local, "priority", INTERACTIVE)
+    for attempt in range(Config.RATE_LIMIT_RETRIES + 1):
+        _acquire(priority)
+        response = None
+        try:
+            response = request()
+        finally:
+            _release(response)
+
+        if response.status_code != 429 or attempt == Config.RATE_LIMIT_RETRIES:
+            return response
+        _back_off(response, attempt)
+    return response
+
+def _acquire(priority):
+    """Block until a request of this priority may start."""
+    global _active, _interactive_waiting, _next_background_slot
+    with _condition:
+        if priority == INTERACTIVE:
+            _interactive_waiting += 1
+        try:
+            while True:
+                delay = _start_delay(priority, time.time())
+                if delay <= 0:
+                    break
+                _condition.wait(timeout=min(delay, Config.RATE_LIMIT_MAX_WAIT))
+        finally:
+            if priority == INTERACTIVE:
+                _interactive_waiting -= 1
+                _condition.notify_all()  # Background requests may have been holding back for this one
+
+        _active += 1
+        if priority == BACKGROUND:
+            _next_background_slot = time.time() + _background_interval()
+
+def _start_delay(priority, now):
+    """Seconds a request of this priority must still wait, or 0 if it may start now."""
+    global _remaining, _reset_at
+    if _reset_at is not None and now >= _reset_at:
+        _remaining = _reset_at = None  # New window; the next response reports the fresh quota
+    if now < _paused_until:
+        return _paused_until - now
+    if _active >= _concurrency_limit():
+        return Config.RATE_LIMIT_MAX_WAIT  # Woken up as soon as a request finishes
+    if priority == BACKGROUND:
+        if _interactive_waiting:
+            return Config.RATE_LIMIT_MAX_WAIT  # Woken up once the interactive request started
+        if _remaining is not None and _remaining <= Config.RATE_LIMIT_RESERVE:
+            return _seconds_until_reset(now)
+        return _next_background_slot - now
+    return 0
+
+def _release(response):
+    """Free the request's slot and record the quota the API reported."""
+    global _active
+    with _condition:
+        _active -= 1
+        if response is not None:
+            _update_quota(response.headers)
+        _condition.notify_all()
+
+def _back_off(response, attempt):
+    """Pause every request after a 429, honouring Retry-After when the API sends it."""
+    global _paused_until
+    try:
+        delay = float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        delay = Config.RATE_LIMIT_BACKOFF * 2 ** attempt
+    delay *= random.uniform(1.0, 1.5)  # Jitter so queued requests don't all retry at once
+
+    logging.warning(f"⏳ API rate limit hit. Retrying in {delay:.1f}s (attempt {attempt + 1}/{Config.RATE_LIMIT_RETRIES}).")
+    with _condition:
+        _paused_until = max(_paused_until, time.time() + delay)
+    time.sleep(delay)
+
+def _update_quota(headers):
+    """
+    Track the quota from the X-RL-* headers. Nexus serves requests from the daily quota first and only
+    falls back to the hourly one once that is spent, so the daily window applies while it has requests left.
+    """
+    global _remaining, _reset_at
+    daily, hourly = _header_int(headers, "X-RL-Daily-Remaining"), _header_int(headers, "X-RL-Hourly-Remaining")
+    if daily is None and hourly is None:
+        return
+
+    window = "Daily" if daily else "Hourly"
+    _remaining = daily if daily else hourly
+    _reset_at = _header_time(headers, f"X-RL-{window}-Reset")
+
+def _concurrency_limit():
+    """Full concurrency while the quota is plentiful, scaling down to one request at a time as it runs out."""
+    if _remaining is None:
+        return Config.API_WORKERS
+    return max(1, min(Config.API_WORKERS, _remaining // 10))
+
+def _background_interval():
+    """Spread background requests evenly over the quota window once the quota runs low."""
+    if _remaining is None or _remaining > Config.RATE_LIMIT_LOW:
+        return 0
+    spare = max(1, _remaining - Config.RATE_LIMIT_RESERVE)
+    return min(_seconds_until_reset(time.time()) / spare, Config.RATE_LIMIT_MAX_WAIT)
+
+def _seconds_until_reset(now):
+    if _reset_at is None:
+        return Config.RATE_LIMIT_MAX_WAIT
+    return max(_reset_at - now, 0) or Config.RATE_LIMIT_BACKOFF
+
+def _header_int(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+def _header_time(headers, name):
+    try:
+        return datetime.fromisoformat(headers.get(name)).timestamp()
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,92 @@
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import Config
+from src.api import rate_limit, connectivity
+from src.api.connectivity import OfflineError
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_lock = threading.Lock()
+
+# Request key -> (expiry, exception or error response) of recently failed requests
+_failures = {}
+_failures_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the process-wide HTTP session, creating it on first use.
+    Connections are kept alive and pooled, so repeated requests to the same host skip the TCP/TLS handshake.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            # Segmented downloads open DOWNLOAD_SEGMENTS connections per file to the same download host
+            pool_size = max(Config.API_WORKERS, Config.DOWNLOAD_WORKERS * Config.DOWNLOAD_SEGMENTS)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(Config.HEADERS)
+            _session = session
+            logging.debug(f"Created shared HTTP session with a pool of {pool_size} connections per host.")
+        return _session
+
+def api_get(url, endpoint="default", **kwargs):
+    """
+    GET a Nexus API endpoint through the shared session, with the API key and the endpoint's timeouts applied.
+    The request is scheduled against the API quota (see `rate_limit`). It fails fast with `OfflineError`
+    in offline mode, and with the same error as last time if the URL failed in the last `NEGATIVE_CACHE_TTL` seconds.
+    """
+    key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+    failure = _recent_failure(key)
+    if isinstance(failure, Exception):
+        raise requests.ConnectionError(f"Not retrying {url} yet, it failed moments ago: {failure}")
+    if failure is not None:
+        return failure
+
+    if not connectivity.is_online():
+        raise OfflineError(f"Offline, not requesting {url}")
+
+    kwargs.setdefault("timeout", _timeout(endpoint))
+    try:
+        response = rate_limit.send(lambda: get_session().get(url, **kwargs))
+    except (requests.ConnectionError, requests.Timeout) as e:
+        _remember_failure(key, e)
+        connectivity.report_connection_failure()
+        raise
+
+    if response.status_code == 404 or response.status_code >= 500:
+        _remember_failure(key, response)
+    return response
+
+def download_get(url, **kwargs):
+    """Stream a file download through the shared session. The API key is not sent to download hosts."""
+    if not connectivity.is_online():
+        raise OfflineError(f"Offline, not downloading {url}")
+
+    kwargs.setdefault("timeout", _timeout("download"))
+    headers = {name: None for name in Config.HEADERS}  # None removes the session-level header
+    headers.update(kwargs.pop("headers", {}))
+    return get_session().get(url, headers=headers, stream=True, **kwargs)
+
+def _timeout(endpoint):
+    return Config.HTTP_TIMEOUTS.get(endpoint, Config.HTTP_TIMEOUTS["default"])
+
+def _recent_failure(key):
+    with _failures_lock:
+        expiry, failure = _failures.get(key, (0, None))
+        if expiry < time.time():
+            _failures.pop(key, None)
+            return None
+        return failure
+
+def _remember_failure(key, failure):
+    with _failures_lock:
+        _failures[key] = (time.time() + Config.NEGATIVE_CACHE_TTL, failure)
@@ -18,12 +18,12 @@ def initialize_mod_data(root, results_tree, progress_label):
         downloaded_files = _load_download_cache()
 
         update_popup = _show_update_popup(root)
-        start_update_thread(root, downloaded_files, update_popup)
+        start_update_thread(downloaded_files, update_popup)
 
         if tracked_mods:
             logging.info("Populating results with cached mods.")
 
-            populate_results_list(results_tree, tracked_mods, downloaded_files)
+            populate_results_list(results_tree, tracked_mods)
             progress_label.config(text="Mods loaded successfully.")
         else:
             logging.info("No cached mods found.")
@@ -13,11 +13,17 @@ class Config:
     # Define the path for the JSON directory inside the main project directory
     JSON_DIR = os.path.join(PROJECT_ROOT, "json")
 
-    # Define file paths for JSON caches inside the json/ subdirectory
+    # Legacy JSON cache files inside the json/ subdirectory (imported into DATABASE_FILE on first run)
     CACHE_FILE = os.path.join(JSON_DIR, "cached_tracked_mods.json")
     DOWNLOADED_FILES_CACHE = os.path.join(JSON_DIR, "downloaded_files.json")
     INSTALLED_FILES_PATH = os.path.join(JSON_DIR, "installed_files.json")
 
+    # SQLite database holding the download, install and tracked mod caches
+    DATABASE_FILE = os.path.join(JSON_DIR, "mod_manager.db")
+
+    # Seconds to wait after a cache change before writing it, so bursts of changes share one write
+    CACHE_FLUSH_DELAY = 0.5
+
     # Define the settings file path inside the json/ directory
     SETTINGS_FILE = os.path.join(JSON_DIR, "settings.json")
 
@@ -32,14 +38,84 @@ class Config:
     # Valid mod folders
     VALID_MOD_FOLDERS = {"bin", "r6", "archive", "red4ext", "engine"}
 
+    # Number of archives extracted concurrently during a batch install
+    INSTALL_WORKERS = 4
+
+    # Number of background tasks (fetches, installs, deletions...) run at the same time
+    TASK_WORKERS = 4
+
+    # Number of files downloaded concurrently by the download queue
+    DOWNLOAD_WORKERS = 3
+    # Times an interrupted download is resumed before it is reported as failed
+    DOWNLOAD_RETRIES = 3
+    # Folder inside the output directory where downloads are kept once per content hash
+    CONTENT_STORE_DIR = ".store"
+    # Stored archives no download links to anymore are kept for later re-downloads up to this many bytes in total;
+    # past it, the longest unused ones are removed
+    CONTENT_STORE_UNUSED_LIMIT = 2 * 1024 * 1024 * 1024
+    # Files of at least this many bytes are downloaded as DOWNLOAD_SEGMENTS byte ranges over parallel connections
+    SEGMENTED_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+    DOWNLOAD_SEGMENTS = 4
+    # Segmented downloads save their progress every this many 1 MB chunks, so they resume after a crash
+    DOWNLOAD_SEGMENT_SAVE_CHUNKS = 16
+
+    # Milliseconds between UI updates from the progress events of background work
+    PROGRESS_REFRESH_MS = 100
+
     # Default settings
     DEFAULT_SETTINGS = {
         "output_dir": DEFAULT_MODS_DIR,  # Set Mods folder as the default output
-        "game_installation_dir": DEFAULT_GAME_DIR
+        "game_installation_dir": DEFAULT_GAME_DIR,
+        "install_workers": INSTALL_WORKERS,
+        "download_workers": DOWNLOAD_WORKERS
+    }
+
+    # API base URL (can be overridden, e.g. to point the app at a local stub server)
+    BASE_URL = os.environ.get("NEXUS_API_BASE_URL", "https://api.nexusmods.com/v1")
+
+    # Concurrent API requests, which is also the size of the shared HTTP connection pool
+    API_WORKERS = 10
+
+    # (connect, read) timeouts in seconds per endpoint; "default" applies to endpoints not listed
+    HTTP_TIMEOUTS = {
+        "default": (5, 15),
+        "tracked_mods": (5, 30),
+        "updated_mods": (5, 30),
+        "download": (10, 60),
+    }
+
+    # Offline mode: timeout of the connectivity probe and seconds before probing again while offline
+    CONNECTIVITY_PROBE_TIMEOUT = 3
+    CONNECTIVITY_RETRY_INTERVAL = 30
+    # Seconds a failed request is remembered, so a dead endpoint is not hit again by every worker
+    NEGATIVE_CACHE_TTL = 30
+
+    # Periods accepted by the "updated mods" feed and how many seconds each covers, smallest first
+    UPDATE_FEED_PERIODS = [("1d", 24 * 60 * 60), ("1w", 7 * 24 * 60 * 60), ("1m", 28 * 24 * 60 * 60)]
+
+    # Rate limiting: retries and base backoff in seconds after a 429, and the longest single wait
+    RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_BACKOFF = 2.0
+    RATE_LIMIT_MAX_WAIT = 30.0
+    # Below RATE_LIMIT_LOW remaining requests background work is paced; the last RATE_LIMIT_RESERVE are kept for the user
+    RATE_LIMIT_LOW = 200
+    RATE_LIMIT_RESERVE = 20
+
+    # Seconds an API response is served from the local cache before it is revalidated with the server
+    HTTP_CACHE_TTL = {
+        "mod_details": 60 * 60,
+        "mod_files": 15 * 60,
+        "file_details": 24 * 60 * 60,
     }
+    # Download links are reused until this many seconds before their `expires` time,
+    # or for DOWNLOAD_LINK_TTL seconds when the link doesn't say when it expires
+    DOWNLOAD_LINK_EXPIRY_MARGIN = 60
+    DOWNLOAD_LINK_TTL = 5 * 60
+    # Queued downloads whose details and links are resolved ahead of their transfer
+    DOWNLOAD_PREFETCH_WORKERS = 2
 
-    # API base URL
-    BASE_URL = "https://api.nexusmods.com/v1"
+    # Maximum number of cached API responses; the least recently used are evicted first
+    HTTP_CACHE_MAX_ENTRIES = 5000
 
     # Load API Key from external manager
     API_KEY = load_api_key()
@@ -1,3 +1,5 @@
 from .download import download_selected_files
+from .download_manager import enqueue_downloads, resume_downloads, has_pending_downloads
+from .tasks import run_task, report_task, cancel_task
 from .deletion import delete_selected_file
-from .install import extract_and_track_files
+from .install import install_archives
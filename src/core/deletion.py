@@ -5,46 +5,47 @@ import re
 from tkinter import messagebox
 
 from src.update import refresh_results, refresh_downloaded_files_ui
-from src.utils import _save_download_cache
+from src.storage import delete_downloaded_file
 from src.api import get_mod_details
+from src.utils import _release_from_store
+from src.core.tasks import run_task
 
 
 logger = logging.getLogger(__name__)
 
 
 def delete_selected_file(listbox, mod_name, mod_files, downloaded_files, popup, results_tree, progress_label, settings, files_tree, game="cyberpunk2077"):
-    """Delete the selected file, update tracking, and refresh UI."""
-    try:
-        selected_index = listbox.curselection()
-        if not selected_index:
-            messagebox.showwarning("Warning", "Please select a file to delete.")
-            return
-
-        selected_file = str(listbox.get(selected_index))
-        file_details = mod_files.get(selected_file)
-        if not file_details:
-            messagebox.showerror("Error", f"Selected file '{selected_file}' not found.")
-            return
-
-        mod_id = file_details.get("mod_id")
-        if not mod_id:
-            messagebox.showerror("Error", f"Missing mod_id for file '{selected_file}'.")
-            return
-
+    """Delete the selected file in a background task, update tracking, and refresh UI."""
+    selected_index = listbox.curselection()
+    if not selected_index:
+        messagebox.showwarning("Warning", "Please select a file to delete.")
+        return
+
+    selected_file = str(listbox.get(selected_index))
+    file_details = mod_files.get(selected_file)
+    if not file_details:
+        messagebox.showerror("Error", f"Selected file '{selected_file}' not found.")
+        return
+
+    mod_id = file_details.get("mod_id")
+    if not mod_id:
+        messagebox.showerror("Error", f"Missing mod_id for file '{selected_file}'.")
+        return
+
+    # Ensure the output directory is retrieved correctly
+    output_dir = settings.get("output_dir", "")
+    if not output_dir:
+        messagebox.showerror("Error", "Output directory is not set. Please configure it in the settings.")
+        return
+
+    def delete(task):
         mod_details = get_mod_details(game, mod_id)
         if not mod_details:
-            messagebox.showerror("Error", f"Failed to fetch mod details for mod ID {mod_id}.")
-            return
+            raise RuntimeError(f"Failed to fetch mod details for mod ID {mod_id}.")
 
         mod_category = mod_details.get("category", "Uncategorized").strip()
         resolved_mod_name = mod_details.get("name", f"Mod_{mod_id}")
 
-        # Ensure the output directory is retrieved correctly
-        output_dir = settings.get("output_dir", "")
-        if not output_dir:
-            messagebox.showerror("Error", "Output directory is not set. Please configure it in the settings.")
-            return
-
         # 🔹 Remove timestamp suffix (_YYYYMMDD_HHMMSS.zip) from filename
         subdir_name = re.sub(r"_\d{8}_\d{6}\.zip$", "", selected_file)
 
@@ -54,17 +55,35 @@ def delete_selected_file(listbox, mod_name, mod_files, downloaded_files, popup,
 
         logging.debug(f"🛠️ Constructed file path for deletion: {file_path}")
 
+        # Nothing has been removed yet, so this is the last point where cancelling is safe
+        if task["cancel_event"].is_set():
+            return False
+
         _delete_file_from_disk(file_path)
         _delete_empty_directory(os.path.dirname(file_path))
-        _remove_file_from_tracking(selected_file, downloaded_files)
+        delete_downloaded_file(selected_file)
+        logging.info(f"Removed '{selected_file}' from tracking.")
+        _release_from_store([file_details.get("sha256")])  # The stored archive is kept for a later re-download
+        return True
+
+    def on_done(deleted):
+        if not deleted:
+            return
+        # The caller's copy of the tracking belongs to the Tk thread, so it's only updated here
+        downloaded_files["files"].pop(selected_file, None)
         refresh_results(results_tree, progress_label)
         refresh_downloaded_files_ui(files_tree)  # Refresh the Downloaded Files tab
 
-        listbox.delete(selected_index)
+        # The selection may have moved while the task ran, so the entry is looked up by name
+        if listbox.winfo_exists() and selected_file in listbox.get(0, "end"):
+            listbox.delete(listbox.get(0, "end").index(selected_file))
         messagebox.showinfo("Success", f"Deleted '{selected_file}' successfully.")
-    except Exception as e:
-        logging.error(f"Error deleting file or directory: {e}")
-        messagebox.showerror("Error", f"Failed to delete file or its directory: {e}")
+
+    def on_error(error):
+        logging.error(f"Error deleting file or directory: {error}")
+        messagebox.showerror("Error", f"Failed to delete file or its directory: {error}")
+
+    run_task(f"Delete {selected_file}", delete, on_done, on_error, serial=True)
 
 def _delete_file_from_disk(file_path):
     """Delete a file from the disk."""
@@ -81,10 +100,3 @@ def _delete_empty_directory(directory_path):
         logging.info(f"Deleted empty directory: {directory_path}")
     else:
         logging.info(f"Directory '{directory_path}' is not empty and was not deleted.")
-
-def _remove_file_from_tracking(selected_file, downloaded_files):
-    """Remove a file from JSON tracking."""
-    if selected_file in downloaded_files["files"]:
-        del downloaded_files["files"][selected_file]
-        _save_download_cache(downloaded_files)
-        logging.info(f"Removed '{selected_file}' from tracking.")
\ No newline at end of file
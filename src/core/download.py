@@ -5,11 +5,13 @@ from src.metadata import track_download_metadata
 from src.api import get_file_details, get_download_link, get_mod_files, get_mod_details
 from src.utils import (
     _clean_directory,
-    _save_download_cache,
     _setup_mod_directory,
     _load_download_cache,
     _download_file,
     _prepare_file_for_download,
+    _store_download,
+    _restore_from_store,
+    _release_from_store,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,17 +37,16 @@ def download_selected_files(game, mod_id, selected_files, output_dir, progress_c
 
     for file_id in selected_files:
         success = _process_and_download_file(
-            game, mod_id, file_id, files, mod_base_dir, downloaded_files, mod_name, progress_callback
+            game, mod_id, file_id, files, mod_base_dir, downloaded_files, mod_name, output_dir, progress_callback
         )
         if not success:
             return False
 
-    _save_download_cache(downloaded_files)
-
     logging.info("Download completed successfully.")
     return True
 
-def _process_and_download_file(game, mod_id, file_id, files, mod_base_dir, downloaded_files, mod_name, progress_callback=None):
+def _process_and_download_file(game, mod_id, file_id, files, mod_base_dir, downloaded_files, mod_name, output_dir,
+                               progress_callback=None):
     """Process and download a single file."""
     logging.info(f"Processing file ID: {file_id} for mod: {mod_name}")
 
@@ -57,18 +58,34 @@ def _process_and_download_file(game, mod_id, file_id, files, mod_base_dir, downl
     file_name, file_path, mod_specific_dir = _prepare_file_for_download(file_details, mod_base_dir)
     logging.info(f"Prepared file for download: {file_name}")
 
-    _clean_directory(mod_specific_dir)
-
     try:
-        logging.info(f"Downloading file: {file_name}")
-        _download_file(get_download_link(game, mod_id, file_id), file_path, progress_callback)
+        # Content that is still in the content store (e.g. deleted and downloaded again, or kept under an old
+        # category) is linked into place instead of being downloaded
+        file_hashes = _restore_from_store(file_details.get("md5"), file_path, file_details.get("size_in_bytes"))
+        if file_hashes is None:
+            logging.info(f"Downloading file: {file_name}")
+            file_hashes = _download_file(
+                get_download_link(game, mod_id, file_id), file_path, progress_callback,
+                expected_size=file_details.get("size_in_bytes"), expected_md5=file_details.get("md5"),
+            )
+            _store_download(file_path, file_hashes, output_dir)
         file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0  # Get file size after download
     except Exception as e:
         logging.error(f"Download failed for file {file_name}: {e}")
         return False
 
+    # Older versions are only removed once the new one is complete and verified
+    replaced_hashes = [
+        downloaded_files.get("files", {}).get(name, {}).get("sha256")
+        for name in os.listdir(mod_specific_dir) if name != file_name
+    ]
+    _clean_directory(mod_specific_dir, keep=file_path)
+    _release_from_store(replaced_hashes)
+
     logging.info(f"Updating metadata for file: {file_name}")
-    updated = track_download_metadata(file_name, file_details, downloaded_files, files, mod_name, mod_id, file_size)
+    updated = track_download_metadata(
+        file_name, file_details, downloaded_files, files, mod_name, mod_id, file_size, file_hashes
+    )
     logging.info(f"File status: {'Outdated' if updated else 'Up-to-date'}")
 
     return True
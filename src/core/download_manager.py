@@ -0,0 +1,127 @@
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import Config
+from src.api import prefetch_download
+from src.core.download import download_selected_files
+from src.storage import database
+from src.utils import publish_progress
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue()
+_jobs = {}          # job_id -> progress of the downloads in the current batch
+_workers = []
+_lock = threading.Lock()
+
+# Resolves details and download links of queued files while earlier transfers are running
+_prefetcher = ThreadPoolExecutor(max_workers=Config.DOWNLOAD_PREFETCH_WORKERS, thread_name_prefix="download-prefetch")
+
+
+def enqueue_downloads(game, mod_id, file_ids, output_dir, label="", workers=None):
+    """
+    Queue files of a mod for download and return their job IDs. Jobs are persisted, so downloads
+    that haven't finished when the app closes are picked up again by `resume_downloads`.
+    Several mods can be queued at once; at most `workers` files are downloaded concurrently.
+    """
+    jobs = []
+    for file_id in file_ids:
+        job_label = f"{label} (file {file_id})" if label else f"File {file_id}"
+        job_id = database.add_download_job(game, mod_id, file_id, output_dir, job_label)
+        jobs.append({"job_id": job_id, "game": game, "mod_id": mod_id, "file_id": file_id,
+                     "output_dir": output_dir, "label": job_label})
+
+    _add_jobs(jobs)
+    _start_workers(workers or Config.DOWNLOAD_WORKERS)
+    return [job["job_id"] for job in jobs]
+
+def resume_downloads(workers=None):
+    """Queue the downloads left over from a previous session. Returns how many were resumed."""
+    jobs = database.load_download_jobs()
+    if jobs:
+        _add_jobs(jobs)
+        logging.info(f"Resuming {len(jobs)} queued download(s).")
+        _start_workers(workers or Config.DOWNLOAD_WORKERS)
+    return len(jobs)
+
+def has_pending_downloads():
+    """Return True if downloads from a previous session are waiting to be resumed."""
+    return bool(database.load_download_jobs())
+
+def _add_jobs(jobs):
+    """
+    Add the jobs to the current batch before any of them is queued, so a worker finishing the first one
+    can't report the batch as finished while the others are still being added.
+    """
+    with _lock:
+        for job in jobs:
+            _jobs[job["job_id"]] = {
+                "job_id": job["job_id"], "label": job["label"], "status": "queued",
+                "percent": 0.0, "downloaded_mb": 0.0, "total_mb": 0.0,
+            }
+    for job in jobs:
+        _queue.put(job)
+        _prefetcher.submit(_prefetch, job)
+    _notify()
+
+def _start_workers(count):
+    """Start download workers until `count` are running."""
+    with _lock:
+        while len(_workers) < count:
+            worker = threading.Thread(target=_worker, daemon=True, name=f"download-worker-{len(_workers) + 1}")
+            _workers.append(worker)
+            worker.start()
+
+def _worker():
+    while True:
+        job = _queue.get()
+        try:
+            _run_job(job)
+        finally:
+            _queue.task_done()
+
+def _run_job(job):
+    job_id = job["job_id"]
+    _update_job(job_id, status="downloading")
+
+    def progress_callback(percent_complete, downloaded_mb, total_mb):
+        _update_job(job_id, percent=percent_complete, downloaded_mb=downloaded_mb, total_mb=total_mb)
+
+    try:
+        success = download_selected_files(
+            job["game"], job["mod_id"], [job["file_id"]], job["output_dir"], progress_callback
+        )
+    except Exception as e:
+        logging.error(f"❌ Download of {job['label']} failed: {e}")
+        success = False
+
+    database.delete_download_job(job_id)
+    _update_job(job_id, status="done" if success else "failed", percent=100.0 if success else None)
+
+def _prefetch(job):
+    """Warm the caches for a queued download; the transfer repeats any request that fails here."""
+    try:
+        prefetch_download(job["game"], job["mod_id"], job["file_id"])
+    except Exception as e:
+        logging.debug(f"Prefetch for {job['label']} failed: {e}")
+
+def _update_job(job_id, **fields):
+    with _lock:
+        if job_id not in _jobs:
+            return
+        _jobs[job_id].update({field: value for field, value in fields.items() if value is not None})
+    _notify()
+
+def _notify():
+    """
+    Publish the batch's progress as a `("downloads", jobs, finished)` progress event, and start a new batch
+    once all its downloads ended. `jobs` is a snapshot of every download in the batch.
+    """
+    with _lock:
+        jobs = [dict(job) for job in _jobs.values()]
+        finished = all(job["status"] in ("done", "failed") for job in jobs)
+        if finished:
+            _jobs.clear()
+    publish_progress("downloads", jobs, finished, final=finished)
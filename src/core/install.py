@@ -1,47 +1,81 @@
+import os
 import logging
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from src.utils import _list_files_recursive, _extract_zip, _extract_rar
+from src.utils import _plan_zip, _stream_zip_members, _stage_rar, _install_from_staging
 
 logger = logging.getLogger(__name__)
 
 
-def extract_and_track_files(file_name, mod_path, game_install_dir):
-    """Extracts and tracks newly created files after extraction."""
-    logging.info(f"📂 Extracting '{file_name}' to {game_install_dir}...")
+def install_archives(archives, game_install_dir, max_workers, progress_callback=None):
+    """
+    Installs several `(file_name, mod_path)` archives concurrently and returns
+    `{file_name: (extracted_files, detected_format)}`.
+    When archives install the same file, only the one that comes last in `archives` writes it,
+    which matches the result of installing them one after another.
+    An archive that fails partway reports the files it already wrote, so they are tracked and can be uninstalled.
+    """
+    results = {}
+    total = len(archives)
 
-    before_extraction = set(_list_files_recursive(game_install_dir))  # ✅ Track correct folder
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Build every manifest first so overlapping files can be assigned before anything is written
+        plans = list(executor.map(lambda archive: _plan_archive(archive[1], game_install_dir), archives))
 
-    extracted_files, detected_format = _extract_archive(mod_path, game_install_dir)
+        owners = {}
+        for index, plan in enumerate(plans):
+            for destination in plan["manifest"].values():
+                owners[_path_key(destination)] = index
 
-    after_extraction = set(_list_files_recursive(game_install_dir))  # ✅ Track correct folder
-    extracted_files = list(after_extraction - before_extraction)  # ✅ Only track new files
+        futures = {}
+        written = {index: [] for index in range(len(plans))}
+        for index, plan in enumerate(plans):
+            owned_manifest = {
+                member: destination for member, destination in plan["manifest"].items()
+                if owners[_path_key(destination)] == index
+            }
+            futures[executor.submit(_commit_archive, plan, owned_manifest, written[index])] = index
 
-    logging.info(f"✅ Tracked extracted files: {extracted_files}")
+        for completed, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            file_name, plan = archives[index][0], plans[index]
+            try:
+                future.result()
+                results[file_name] = (list(plan["manifest"].values()), plan["format"])
+            except Exception as e:
+                logging.error(f"❌ Failed to install '{file_name}': {e}")
+                results[file_name] = (written[index], plan["format"] if written[index] else None)
 
-    return extracted_files if extracted_files else [], detected_format
+            if progress_callback:
+                progress_callback(file_name, completed, total)
 
-def _extract_archive(file_path, extract_to):
-    extracted_files = []
-    detected_format = None
+    return results
 
-    # Get list of files **before extraction** to track only new files
-    before_extraction = set(_list_files_recursive(extract_to))
+def _path_key(path):
+    """Compare install paths the way the filesystem does, so differently cased paths on Windows count as one file."""
+    return os.path.normcase(os.path.normpath(path))
 
+def _plan_archive(file_path, extract_to):
+    """Reads (ZIP) or stages (RAR) an archive and returns its install plan."""
+    plan = {"file_path": file_path, "format": None, "manifest": {}, "staging_dir": None}
     try:
         # Always try ZIP first, even if it might be a RAR file
-        extracted_files = _extract_zip(file_path, extract_to)
-        detected_format = "zip"
-
+        plan.update(format="zip", manifest=_plan_zip(file_path, extract_to))
     except zipfile.BadZipFile:
         try:
-            extracted_files = _extract_rar(file_path, extract_to)
-            detected_format = "rar"
+            staging_dir, manifest = _stage_rar(file_path, extract_to)
+            plan.update(format="rar", manifest=manifest, staging_dir=staging_dir)
         except Exception as e:
-            return [], None
-
-    # Get list of files **after extraction** and track only newly created files
-    after_extraction = set(_list_files_recursive(extract_to))
-    extracted_files = list(after_extraction - before_extraction)
+            logging.error(f"Failed to extract '{file_path}': {e}")
+    except Exception as e:
+        logging.error(f"Failed to read '{file_path}': {e}")
+    return plan
 
-    return extracted_files, detected_format
+def _commit_archive(plan, owned_manifest, installed):
+    """Writes the files an archive owns to the game directory, appending each one to `installed` as it lands."""
+    if plan["format"] == "zip":
+        return _stream_zip_members(plan["file_path"], owned_manifest, installed)
+    if plan["staging_dir"]:
+        return _install_from_staging(plan["staging_dir"], owned_manifest, installed)
+    return []
@@ -0,0 +1,98 @@
+import logging
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import Config
+from src.utils import publish_progress, subscribe_progress
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=Config.TASK_WORKERS, thread_name_prefix="task")
+# Tasks that change files on disk or their tracking (installs, uninstalls, deletions) run one at a time, in order
+_serial_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-serial")
+_tasks = {}         # task_id -> running or queued task
+_callbacks = {}     # task_id -> (on_done, on_error), called on the Tk thread
+_ids = itertools.count(1)
+_lock = threading.Lock()
+
+
+def run_task(name, work, on_done=None, on_error=None, cancellable=True, serial=False):
+    """
+    Run the blocking `work(task)` on a background thread and return the task's ID.
+    `task["cancel_event"]` is set when the task is cancelled; `work` checks it and returns early.
+    `on_done(result)` or `on_error(error)` is called on the Tk thread once `work` returns or raises,
+    so they may touch widgets; `on_done` also runs after a cancellation, with whatever `work` returned.
+    `serial` tasks wait for each other, so two of them never change the same files at once.
+    Running tasks are published as `("tasks", tasks)` progress events for the task list.
+    """
+    task_id = next(_ids)
+    task = {
+        "task_id": task_id, "name": name, "status": "queued", "detail": "",
+        "cancellable": cancellable, "cancel_event": threading.Event(),
+    }
+    with _lock:
+        _tasks[task_id] = task
+        _callbacks[task_id] = (on_done, on_error)
+    _publish_tasks()
+
+    (_serial_executor if serial else _executor).submit(_run, task, work)
+    return task_id
+
+def report_task(task, detail):
+    """Show what a running task is doing in the task list."""
+    with _lock:
+        task["detail"] = detail
+    _publish_tasks()
+
+def cancel_task(task_id):
+    """Ask a task to stop. Returns False if it can't be cancelled or has already finished."""
+    with _lock:
+        task = _tasks.get(task_id)
+        if not task or not task["cancellable"]:
+            return False
+        task["cancel_event"].set()
+        task["status"] = "cancelling"
+    logging.info(f"Cancelling task '{task['name']}'.")
+    _publish_tasks()
+    return True
+
+def _run(task, work):
+    with _lock:
+        if task["status"] == "queued":
+            task["status"] = "running"
+    _publish_tasks()
+
+    result, error = None, None
+    try:
+        result = work(task)
+    except Exception as e:
+        logging.error(f"❌ Task '{task['name']}' failed: {e}")
+        error = e
+
+    with _lock:
+        del _tasks[task["task_id"]]
+    _publish_tasks()
+    publish_progress("task-finished", task["task_id"], result, error, final=True)
+
+def _finish(task_id, result, error):
+    """Hand a finished task's outcome to its callbacks on the Tk thread."""
+    with _lock:
+        on_done, on_error = _callbacks.pop(task_id, (None, None))
+    if error is None and on_done:
+        on_done(result)
+    elif error is not None and on_error:
+        on_error(error)
+
+def _snapshot():
+    return [
+        {field: value for field, value in task.items() if field != "cancel_event"}
+        for task in _tasks.values()
+    ]
+
+def _publish_tasks():
+    with _lock:
+        tasks = _snapshot()
+    publish_progress("tasks", tasks)
+
+subscribe_progress("task-finished", _finish)
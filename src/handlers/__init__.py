@@ -1,5 +1,5 @@
 from .modify_files import handle_modify_files
-from .file_download import handle_file_download
+from .file_download import handle_file_download, resume_pending_downloads
 from .file_install import handle_file_install
 from .file_uninstall import handle_file_uninstall
 from .mod_search import handle_mod_search
\ No newline at end of file
@@ -3,16 +3,22 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, List
 
-from src.core import download_selected_files
+from src.config import Config
+from src.core import enqueue_downloads, resume_downloads, has_pending_downloads
 from src.ui import show_file_selection_popup
 from src.update import refresh_results, refresh_downloaded_files_ui
-from src.utils import _update_progress_bar, _get_selected_mod
+from src.utils import _update_progress_bar, _get_selected_mod, subscribe_progress
 
 logger = logging.getLogger(__name__)
 
+# The progress window shared by every queued download, created when the first download of a batch is queued
+_progress_window = {}
+# The lists refreshed once a batch finishes, from the handler that last queued downloads
+_refresh_targets = {}
+
 
 def handle_file_download(results_tree: ttk.Treeview, progress_label: tk.Label, settings: Dict, files_tree: ttk.Treeview):
-    """Handle downloading selected mod files with a progress bar."""
+    """Queue the selected mod files for download; they download in the background with a progress window."""
     try:
         # Get selected mod
         selected_item = _get_selected_mod(results_tree)
@@ -27,44 +33,11 @@ def handle_file_download(results_tree: ttk.Treeview, progress_label: tk.Label, s
                 messagebox.showinfo("No Selection", "No files were selected.")
                 return
 
-            # Create a progress bar window
-            progress_window = tk.Toplevel()
-            progress_window.title("Downloading Files")
-            progress_window.geometry("400x150")
-
-            tk.Label(progress_window, text=f"Downloading files for {mod_name}...", font=("Arial", 12)).pack(pady=10)
-            progress_bar = ttk.Progressbar(progress_window, length=300, mode="determinate", maximum=100)
-            progress_bar.pack(pady=10)
-            progress_label = tk.Label(progress_window, text="Initializing download...")
-            progress_label.pack(pady=5)
-
-            progress_window.update()
-
-            try:
-                total_files = len(selected_files)
-                for index, file_id in enumerate(selected_files, start=1):
-                    def progress_callback(percent_complete, downloaded_mb, total_mb):
-                        """Update the progress bar for the current file."""
-                        cumulative_percent = ((index - 1) / total_files * 100) + (percent_complete / total_files)
-                        _update_progress_bar(progress_bar, progress_label, cumulative_percent, downloaded_mb, total_mb)
-
-                    success = download_selected_files(
-                        "cyberpunk2077", mod_id, [file_id], settings["output_dir"], progress_callback
-                    )
-                    if not success:
-                        messagebox.showerror("Error", f"Failed to download file with ID {file_id}.")
-                        progress_window.destroy()
-                        return
-
-                refresh_results(results_tree, progress_label)
-                refresh_downloaded_files_ui(files_tree)
-
-                messagebox.showinfo("Success", f"Downloaded {total_files} file(s) successfully!")
-            except Exception as e:
-                logging.error(f"Error during file download: {e}")
-                messagebox.showerror("Error", f"Failed to download files: {e}")
-            finally:
-                progress_window.destroy()
+            _show_progress_window(results_tree, progress_label, files_tree)
+            enqueue_downloads(
+                "cyberpunk2077", mod_id, selected_files, settings["output_dir"], label=mod_name,
+                workers=settings.get("download_workers", Config.DOWNLOAD_WORKERS),
+            )
 
         # Show file selection popup
         show_file_selection_popup("cyberpunk2077", mod_id, on_files_selected)
@@ -72,3 +45,82 @@ def handle_file_download(results_tree: ttk.Treeview, progress_label: tk.Label, s
     except Exception as e:
         logging.error(f"Error in handle_mod_download: {e}")
         messagebox.showerror("Error", f"Failed to download mod: {e}")
+
+def resume_pending_downloads(results_tree: ttk.Treeview, progress_label: tk.Label, settings: Dict, files_tree: ttk.Treeview):
+    """Pick up downloads that were still queued when the app was last closed."""
+    if not has_pending_downloads():
+        return
+    _show_progress_window(results_tree, progress_label, files_tree)
+    resume_downloads(settings.get("download_workers", Config.DOWNLOAD_WORKERS))
+
+def _show_progress_window(results_tree, progress_label, files_tree):
+    """Show the download progress window, creating it unless it is already open."""
+    _refresh_targets.update(results_tree=results_tree, progress_label=progress_label, files_tree=files_tree)
+    if _progress_window:
+        _progress_window["window"].deiconify()
+        return
+    _open_progress_window()
+
+def _open_progress_window():
+    window = tk.Toplevel()
+    window.title("Downloading Files")
+    window.geometry("450x300")
+    window.protocol("WM_DELETE_WINDOW", window.withdraw)  # Downloads keep going in the background
+
+    tk.Label(window, text="Downloading files...", font=("Arial", 12)).pack(pady=10)
+    progress_bar = ttk.Progressbar(window, length=350, mode="determinate", maximum=100)
+    progress_bar.pack(pady=5)
+    total_label = tk.Label(window, text="Initializing download...")
+    total_label.pack(pady=5)
+    files_label = tk.Label(window, text="", justify="left", anchor="w")
+    files_label.pack(fill="x", padx=10, pady=5)
+
+    _progress_window.update(window=window, progress_bar=progress_bar, total_label=total_label, files_label=files_label)
+
+def _on_download_progress(jobs, finished):
+    """
+    Render the download queue's progress events, delivered on the Tk thread at the UI refresh rate.
+    A batch queued while the previous one's last event was still waiting to be delivered gets a new window
+    once that event closed the old one.
+    """
+    if not _progress_window and not finished:
+        _open_progress_window()
+
+    if _progress_window and _progress_window["window"].winfo_exists():
+        # Aggregate progress gives every queued file the same weight, whatever its size
+        percent = sum(job["percent"] for job in jobs) / len(jobs) if jobs else 0
+        downloaded_mb = sum(job["downloaded_mb"] for job in jobs)
+        total_mb = sum(job["total_mb"] for job in jobs)
+        _update_progress_bar(_progress_window["progress_bar"], _progress_window["total_label"], percent, downloaded_mb, total_mb)
+        _progress_window["files_label"].config(text="\n".join(_describe_job(job) for job in jobs))
+
+    if finished:
+        _finish_batch(jobs)
+
+def _describe_job(job):
+    if job["status"] == "downloading" and job["total_mb"]:
+        return f"{job['label']}: {job['percent']:.0f}% ({job['downloaded_mb']:.1f}/{job['total_mb']:.1f} MB)"
+    return f"{job['label']}: {job['status']}"
+
+def _finish_batch(jobs):
+    """Close the progress window, refresh the lists and report the outcome once the queue is drained."""
+    _close_progress_window()
+
+    refresh_results(_refresh_targets["results_tree"], _refresh_targets["progress_label"])
+    refresh_downloaded_files_ui(_refresh_targets["files_tree"])
+
+    failed = [job["label"] for job in jobs if job["status"] == "failed"]
+    if failed:
+        messagebox.showerror("Error", "Failed to download:\n" + "\n".join(failed))
+    else:
+        messagebox.showinfo("Success", f"Downloaded {len(jobs)} file(s) successfully!")
+
+def _close_progress_window():
+    if not _progress_window:
+        return
+    if _progress_window["window"].winfo_exists():
+        _progress_window["window"].destroy()
+    _progress_window.clear()
+
+# Subscribed once rather than per window, so no batch's events arrive while nothing is listening
+subscribe_progress("downloads", _on_download_progress)
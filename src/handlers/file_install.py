@@ -1,13 +1,15 @@
 import logging
 from tkinter import messagebox
-from src.core.install import extract_and_track_files
+
+from src.config import Config
+from src.core import run_task, report_task
+from src.core.install import install_archives
 from src.update import refresh_downloaded_files_ui, refresh_archives_ui
 from src.utils import (
     _install_progress_window,
     _load_download_cache,
-    _save_download_cache,
-    _load_installed_files,
-    _save_installed_files, _get_file_details, _validate_installation_settings
+    _track_installed_file, _get_file_details, _validate_installation_settings,
+    publish_progress, subscribe_progress, unsubscribe_progress
 )
 
 logger = logging.getLogger(__name__)
@@ -24,58 +26,88 @@ def handle_file_install(files_tree, settings, archives_tree):
     if not game_install_dir:
         return  # Error message already shown inside `_validate_installation_settings`
 
-    installed_files = _load_installed_files()
-    downloaded_files = _load_download_cache()
+    file_names = [files_tree.item(item, "values")[1] for item in selected_items]  # Get filenames from tree selection
+    max_workers = settings.get("install_workers", Config.INSTALL_WORKERS)
 
     progress_window, progress_label = _install_progress_window()
-    progress_window.update()  # Force UI to refresh
-
-    try:
-        for item in selected_items:
-            file_name = files_tree.item(item, "values")[1]  # Get filename from tree selection
-            file_details = downloaded_files.get("files", {}).get(file_name)
-
-            if not file_details:
-                logging.warning(f"⚠️ File '{file_name}' not found in tracking. Skipping.")
-                continue
-
-            mod_path, mod_name, tracking_key = _get_file_details(file_name, file_details, settings)
-            if not mod_path:
-                logging.warning(f"⚠️ File '{file_name}' does not exist. Skipping.")
-                continue
-
-            progress_label.config(text=f"Extracting {file_name}...")
-            progress_window.update()
-
-            try:
-                extracted_files, detected_format = extract_and_track_files(file_name, mod_path, game_install_dir)
+    topic = f"installs-{id(progress_window)}"  # Batches installing at the same time each get their own events
+
+    def on_archive_installed(file_name, completed, total):
+        if progress_window.winfo_exists():
+            progress_label.config(text=f"Installed {completed}/{total}: {file_name}")
+
+    def install(task):
+        # Progress goes through the progress events, so the install workers never touch Tk
+        def report(file_name, completed, total):
+            publish_progress(topic, file_name, completed, total)
+            report_task(task, f"{completed}/{total} archives")
+
+        jobs = _resolve_install_jobs(file_names, _load_download_cache(), settings)
+        results = install_archives(
+            [(job["file_name"], job["mod_path"]) for job in jobs], game_install_dir, max_workers, report
+        )
+        return jobs, results
+
+    def on_error(error):
+        logging.error(f"❌ Unexpected error during batch install: {error}")
+        _finish_install([], {}, error)
+
+    def _finish_install(jobs, results, error):
+        """Record installed files and refresh the UI once every archive has been processed."""
+        unsubscribe_progress(topic, on_archive_installed)
+        try:
+            for job in jobs:
+                file_name = job["file_name"]
+                extracted_files, detected_format = results.get(file_name, ([], None))
 
                 if not extracted_files:
                     logging.warning(f"⚠️ No valid files extracted from '{file_name}'. Skipping tracking.")
                     continue
 
-                installed_files[tracking_key] = {
-                    "mod_name": mod_name,
-                    "author_upload": file_details.get("latest_downloaded_timestamp"),
+                _track_installed_file(job["tracking_key"], {
+                    "mod_name": job["mod_name"],
+                    "author_upload": job["file_details"].get("latest_downloaded_timestamp"),
                     "extracted_files": extracted_files
-                }
-
-                logging.info(f"✅ Installed '{tracking_key}' successfully.")
-
-            except ValueError as ve:
-                logging.error(f"❌ Unsupported file format: {ve}")
-                messagebox.showerror("Error", str(ve))
-
-            except Exception as e:
-                logging.error(f"❌ Unexpected error extracting '{file_name}': {e}")
-                messagebox.showerror("Error", f"Unexpected error extracting '{file_name}'. Check logs for details.")
-
-    finally:
-        _save_installed_files(installed_files)
-        _save_download_cache(downloaded_files)
-
-        progress_window.destroy()
-        messagebox.showinfo("Success", "Selected mods have been installed.")
-
-        refresh_downloaded_files_ui(files_tree)
-        refresh_archives_ui(archives_tree)
+                })
+
+                logging.info(f"✅ Installed '{job['tracking_key']}' successfully.")
+        finally:
+            progress_window.destroy()
+            if error:
+                messagebox.showerror("Error", "Unexpected error while installing mods. Check logs for details.")
+            else:
+                messagebox.showinfo("Success", "Selected mods have been installed.")
+
+            refresh_downloaded_files_ui(files_tree)
+            refresh_archives_ui(archives_tree)
+
+    # Run the batch as a background task so that the UI doesn't freeze.
+    # It isn't cancellable: stopping between archives would leave installed files untracked.
+    subscribe_progress(topic, on_archive_installed)
+    run_task(f"Install {len(file_names)} mod(s)", install, lambda outcome: _finish_install(*outcome, None), on_error,
+             cancellable=False, serial=True)
+
+
+def _resolve_install_jobs(file_names, downloaded_files, settings):
+    """Look up the archive path and tracking details for each selected file, in selection order."""
+    jobs = []
+    for file_name in file_names:
+        file_details = downloaded_files.get("files", {}).get(file_name)
+
+        if not file_details:
+            logging.warning(f"⚠️ File '{file_name}' not found in tracking. Skipping.")
+            continue
+
+        mod_path, mod_name, tracking_key = _get_file_details(file_name, file_details, settings)
+        if not mod_path:
+            logging.warning(f"⚠️ File '{file_name}' does not exist. Skipping.")
+            continue
+
+        jobs.append({
+            "file_name": file_name,
+            "file_details": file_details,
+            "mod_path": mod_path,
+            "mod_name": mod_name,
+            "tracking_key": tracking_key,
+        })
+    return jobs
@@ -2,8 +2,9 @@ import os
 import logging
 from tkinter import messagebox
 
+from src.core import run_task, report_task
 from src.update import refresh_downloaded_files_ui, refresh_archives_ui
-from src.utils import _load_installed_files, _save_installed_files, _find_matching_mod, _remove_file_safely
+from src.utils import _load_installed_files, _untrack_installed_file, _find_matching_mod, _remove_file_safely
 
 logger = logging.getLogger(__name__)
 
@@ -20,33 +21,49 @@ def handle_file_uninstall(files_tree, settings, archives_tree):
         messagebox.showerror("Error", "Game installation folder is not set or does not exist. Please configure it in settings.")
         return
 
-    installed_files = _load_installed_files()
+    file_names = [files_tree.item(item, "values")[1] for item in selected_items]  # Get filenames from tree selection
 
-    for item in selected_items:
-        file_name = files_tree.item(item, "values")[1]  # Get filename from tree selection
+    def uninstall(task):
+        # Loaded here, once earlier serial tasks (installs, other uninstalls) have finished changing it
+        installed_files = _load_installed_files()
+        for index, file_name in enumerate(file_names):
+            # Stop between mods, so a cancelled batch never leaves a mod half removed
+            if task["cancel_event"].is_set():
+                logging.info("Uninstall cancelled. The remaining mods were left installed.")
+                return False
+            report_task(task, f"{index}/{len(file_names)} mods")
 
-        # Find matching mod, ignoring file extensions
-        tracked_file_name = _find_matching_mod(file_name, installed_files)
-        if not tracked_file_name:
-            logging.warning(f"Mod '{file_name}' is not tracked as installed. Skipping.")
-            continue
+            # Find matching mod, ignoring file extensions
+            tracked_file_name = _find_matching_mod(file_name)
+            if not tracked_file_name or tracked_file_name not in installed_files:
+                logging.warning(f"Mod '{file_name}' is not tracked as installed. Skipping.")
+                continue
 
-        logging.info(f"Uninstalling '{tracked_file_name}'...")
+            logging.info(f"Uninstalling '{tracked_file_name}'...")
 
-        mod_data = installed_files[tracked_file_name]
-        extracted_files = mod_data.get("extracted_files", [])
+            mod_data = installed_files[tracked_file_name]
+            extracted_files = mod_data.get("extracted_files", [])
 
-        # Delete only files, skip directories
-        for file_path in extracted_files:
-            if os.path.isfile(file_path):  # Only removes files, never folders
-                _remove_file_safely(file_path)
-            else:
-                logging.info(f"Skipping directory: {file_path}")
+            # Delete only files, skip directories
+            for file_path in extracted_files:
+                if os.path.isfile(file_path):  # Only removes files, never folders
+                    _remove_file_safely(file_path)
+                else:
+                    logging.info(f"Skipping directory: {file_path}")
 
-        # Remove from installed tracking
-        del installed_files[tracked_file_name]
+            # Remove from installed tracking
+            del installed_files[tracked_file_name]
+            _untrack_installed_file(tracked_file_name)
+        return True
 
-    _save_installed_files(installed_files)
-    messagebox.showinfo("Success", "Selected mods have been uninstalled.")
-    refresh_downloaded_files_ui(files_tree)  # Refresh UI properly
-    refresh_archives_ui(archives_tree)  # Refresh Installed Archives
+    def on_done(completed):
+        if completed:
+            messagebox.showinfo("Success", "Selected mods have been uninstalled.")
+        refresh_downloaded_files_ui(files_tree)  # Refresh UI properly
+        refresh_archives_ui(archives_tree)  # Refresh Installed Archives
+
+    def on_error(error):
+        messagebox.showerror("Error", f"Failed to uninstall mods: {error}")
+        on_done(False)
+
+    run_task(f"Uninstall {len(file_names)} mod(s)", uninstall, on_done, on_error, serial=True)
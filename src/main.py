@@ -2,14 +2,18 @@ import logging
 from typing import Dict
 
 from src.app import setup_file_buttons, setup_tracked_mods_tab, initialize_mod_data
-from src.ui import create_file_list, create_archive_tab, create_settings_panel
-from src.utils import _initialize_main_window, _create_tabs, configure_logging
+from src.handlers import resume_pending_downloads
+from src.ui import create_file_list, create_archive_tab, create_settings_panel, create_tasks_panel
+from src.utils import _initialize_main_window, _create_tabs, configure_logging, start_progress_pump
 from src.settings import load_settings, ensure_directories
+from src.storage import flush
 
 def main(settings: Dict):
     """Initialize and run the main UI for Cyberpunk Mod Manager."""
     root = _initialize_main_window()
+    start_progress_pump(root)  # Background work reports progress through events drained on this thread
     notebook, mods_frame, files_frame = _create_tabs(root)
+    create_tasks_panel(root)
 
     files_tree = create_file_list(files_frame)
     archives_frame, archives_tree = create_archive_tab(notebook)
@@ -19,6 +23,7 @@ def main(settings: Dict):
     results_tree, progress_label = setup_tracked_mods_tab(mods_frame, settings, files_tree)
 
     initialize_mod_data(root, results_tree, progress_label)
+    resume_pending_downloads(results_tree, progress_label, settings, files_tree)
 
     root.mainloop()
 
@@ -27,7 +32,10 @@ def run():
     configure_logging()
     settings = load_settings()
     ensure_directories(settings)
-    main(settings)
+    try:
+        main(settings)
+    finally:
+        flush()  # Write any cache changes still waiting for the debounce timer
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
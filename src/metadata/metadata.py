@@ -2,12 +2,16 @@ import logging
 import re
 from datetime import datetime
 
-from src.utils import _save_download_cache, _parse_file_timestamp, _format_timestamp
+from src.storage import upsert_downloaded_file, delete_downloaded_file
+from src.utils import _parse_file_timestamp, _format_timestamp
 
 logger = logging.getLogger(__name__)
 
-def track_download_metadata(file_name, file_details, downloaded_files, files, mod_name, mod_id, file_size):
-    """Update metadata for downloaded files, ensuring only exact base name matches are replaced."""
+def track_download_metadata(file_name, file_details, downloaded_files, files, mod_name, mod_id, file_size, file_hashes=None):
+    """
+    Update metadata for downloaded files, ensuring only exact base name matches are replaced.
+    `file_hashes` (`{"md5": ..., "sha256": ...}`, computed while downloading) is recorded with the entry.
+    """
     logging.info(f"🔍 Processing metadata update for file: {file_name}")
 
     base_file_name = re.sub(r'\_\d{8}_\d{6}', '', file_name).rsplit(".", 1)[0]  # Remove _YYYYMMDD_HHMMSS
@@ -15,6 +19,7 @@ def track_download_metadata(file_name, file_details, downloaded_files, files, mo
 
     existing_files = downloaded_files.get("files", {})
 
+    replaced_files = [key for key in existing_files if key.split("_")[0] == base_file_name]
     existing_files = {
         key: value for key, value in existing_files.items()
         if key.split("_")[0] != base_file_name
@@ -34,12 +39,17 @@ def track_download_metadata(file_name, file_details, downloaded_files, files, mo
         "file_size": file_size,
         "latest_downloaded_timestamp": datetime.strftime(parsed_timestamp, "%Y-%m-%d %H:%M:%S") if parsed_timestamp else "Unknown",
         "latest_uploaded_timestamp": _format_timestamp(latest_timestamp) if latest_timestamp > 0 else "Unknown",
+        **(file_hashes or {}),
     }
 
     logging.info(f"Updated metadata entry for file: {base_file_name}")
 
     downloaded_files["files"] = existing_files
-    _save_download_cache(downloaded_files)
+
+    # Only the replaced versions and the new entry are written, not the whole cache
+    for key in replaced_files:
+        delete_downloaded_file(key)
+    upsert_downloaded_file(file_name, existing_files[file_name])
 
     return is_outdated
 
@@ -46,7 +46,9 @@ def load_settings():
 
 
 def save_settings(settings):
-    """Save settings to json/settings.json file."""
-    with open(Config.SETTINGS_FILE, 'w') as f:
+    """Save settings to json/settings.json file, replacing it atomically so a crash can't leave it half-written."""
+    temp_file = f"{Config.SETTINGS_FILE}.tmp"
+    with open(temp_file, 'w') as f:
         json.dump(settings, f, indent=4)
+    os.replace(temp_file, Config.SETTINGS_FILE)
     logging.debug(f"Saved settings: {settings}")
@@ -0,0 +1,18 @@
+from .database import download_base_name, download_timestamp, installed_base_name, load_meta, save_meta
+from .state import (
+    load_downloaded_files,
+    upsert_downloaded_file,
+    update_downloaded_files,
+    delete_downloaded_file,
+    mod_file_states,
+    is_version_downloaded,
+    load_installed_files,
+    upsert_installed_file,
+    delete_installed_file,
+    find_installed_key,
+    rename_installed_path,
+    list_installed_paths,
+    load_tracked_mods,
+    save_tracked_mods,
+    flush,
+)
@@ -0,0 +1,384 @@
+import os
+import re
+import json
+import sqlite3
+import calendar
+import logging
+import threading
+from datetime import datetime
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_connection = None
+_lock = threading.RLock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloaded_files (
+    file_name TEXT PRIMARY KEY,
+    base_name TEXT NOT NULL,
+    mod_id INTEGER,
+    mod_name TEXT,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_downloaded_mod_id ON downloaded_files (mod_id);
+CREATE INDEX IF NOT EXISTS idx_downloaded_mod_name ON downloaded_files (mod_name);
+CREATE INDEX IF NOT EXISTS idx_downloaded_base_name ON downloaded_files (base_name);
+
+CREATE TABLE IF NOT EXISTS installed_files (
+    tracking_key TEXT PRIMARY KEY,
+    base_name TEXT NOT NULL,
+    mod_name TEXT,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_installed_base_name ON installed_files (base_name);
+CREATE INDEX IF NOT EXISTS idx_installed_mod_name ON installed_files (mod_name);
+
+CREATE TABLE IF NOT EXISTS installed_paths (
+    tracking_key TEXT NOT NULL REFERENCES installed_files (tracking_key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (tracking_key, position)
+);
+CREATE INDEX IF NOT EXISTS idx_installed_paths_path ON installed_paths (path);
+
+CREATE TABLE IF NOT EXISTS tracked_mods (
+    mod_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tracked_mods_name ON tracked_mods (name);
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_http_cache_accessed_at ON http_cache (accessed_at);
+
+CREATE TABLE IF NOT EXISTS download_queue (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game TEXT NOT NULL,
+    mod_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    output_dir TEXT NOT NULL,
+    label TEXT
+);
+
+CREATE TABLE IF NOT EXISTS content_store (
+    sha256 TEXT PRIMARY KEY,
+    md5 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    released_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_content_store_md5 ON content_store (md5);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _get_connection():
+    """Open the database on first use, creating the schema and migrating the JSON caches if needed."""
+    global _connection
+    with _lock:
+        if _connection is None:
+            _connection = sqlite3.connect(Config.DATABASE_FILE, check_same_thread=False)
+            _connection.execute("PRAGMA foreign_keys = ON")
+            _connection.execute("PRAGMA journal_mode = WAL")
+            _connection.executescript(SCHEMA)
+            _migrate_json_caches(_connection)
+        return _connection
+
+def data_version():
+    """
+    Return SQLite's data_version counter, which changes whenever another connection commits.
+    Writes made through this module's own connection leave it unchanged.
+    """
+    with _lock:
+        return _get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+def download_base_name(file_name):
+    """Strip the _YYYYMMDD_HHMMSS suffix and the extension from a downloaded file name."""
+    return re.sub(r"_\d{8}_\d{6}", "", file_name).rsplit(".", 1)[0]
+
+def download_timestamp(file_name):
+    """Return the upload time encoded in a downloaded file name as a UTC epoch, or None if it has none."""
+    match = re.search(r"_(\d{8}_\d{6})\.[^.]+$", file_name)
+    if not match:
+        return None
+    try:
+        return calendar.timegm(datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timetuple())
+    except ValueError:
+        return None
+
+def installed_base_name(tracking_key):
+    """Strip the extension from an installed tracking key."""
+    return tracking_key.rsplit(".", 1)[0]
+
+def _encode(value):
+    return json.dumps(value, sort_keys=True)
+
+def _migrate_json_caches(connection):
+    """Import the legacy JSON caches the first time the database is opened."""
+    if connection.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+        return
+
+    legacy_files = {
+        "downloaded": Config.DOWNLOADED_FILES_CACHE,
+        "installed": Config.INSTALLED_FILES_PATH,
+        "tracked": Config.CACHE_FILE,
+    }
+    with connection:
+        for kind, path in legacy_files.items():
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logging.error(f"Failed to read legacy cache '{path}' during migration: {e}")
+                continue
+
+            if kind == "downloaded":
+                _write_downloaded_files(connection, data.get("files", {}))
+            elif kind == "installed":
+                _write_installed_files(connection, data)
+            else:
+                _write_tracked_mods(connection, data)
+            logging.info(f"Migrated legacy cache '{path}' into {Config.DATABASE_FILE}")
+
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', '1')")
+
+def load_meta(key, default=None):
+    """Return a value from the meta table, or `default` if it was never set."""
+    with _lock:
+        row = _get_connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def save_meta(key, value):
+    """Store a value in the meta table."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def write_changes(downloaded=None, installed=None, tracked=None):
+    """
+    Apply pending cache changes in a single transaction, so a flush is either fully written or not at all.
+    `downloaded` and `installed` map keys to their new entry, or to None for removed keys.
+    `tracked` replaces the tracked mods list when given.
+    """
+    downloaded = downloaded or {}
+    installed = installed or {}
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            _write_downloaded_files(connection, {name: entry for name, entry in downloaded.items() if entry is not None})
+            connection.executemany(
+                "DELETE FROM downloaded_files WHERE file_name = ?",
+                [(name,) for name, entry in downloaded.items() if entry is None],
+            )
+            _write_installed_files(connection, {key: entry for key, entry in installed.items() if entry is not None})
+            connection.executemany(
+                "DELETE FROM installed_files WHERE tracking_key = ?",
+                [(key,) for key, entry in installed.items() if entry is None],
+            )
+            if tracked is not None:
+                connection.execute("DELETE FROM tracked_mods")
+                _write_tracked_mods(connection, tracked)
+
+
+# Downloaded files
+
+def load_downloaded_files():
+    """Return all downloaded file metadata keyed by file name."""
+    with _lock:
+        rows = _get_connection().execute("SELECT file_name, metadata FROM downloaded_files").fetchall()
+    return {file_name: json.loads(metadata) for file_name, metadata in rows}
+
+def _write_downloaded_files(connection, files):
+    connection.executemany(
+        "INSERT OR REPLACE INTO downloaded_files (file_name, base_name, mod_id, mod_name, metadata) VALUES (?, ?, ?, ?, ?)",
+        [(file_name, download_base_name(file_name), metadata.get("mod_id"), metadata.get("mod_name"), _encode(metadata))
+         for file_name, metadata in files.items()],
+    )
+
+
+# Installed files
+
+def load_installed_files():
+    """Return installed mod entries keyed by tracking key, including their extracted file paths."""
+    with _lock:
+        connection = _get_connection()
+        entries = {key: {**json.loads(metadata), "extracted_files": []} for key, metadata in
+                   connection.execute("SELECT tracking_key, metadata FROM installed_files").fetchall()}
+        for key, path in connection.execute(
+            "SELECT tracking_key, path FROM installed_paths ORDER BY tracking_key, position"
+        ).fetchall():
+            entries[key]["extracted_files"].append(path)
+    return entries
+
+def _write_installed_files(connection, installed_files):
+    for key, entry in installed_files.items():
+        metadata = {field: value for field, value in entry.items() if field != "extracted_files"}
+        connection.execute("DELETE FROM installed_files WHERE tracking_key = ?", (key,))
+        connection.execute(
+            "INSERT INTO installed_files (tracking_key, base_name, mod_name, metadata) VALUES (?, ?, ?, ?)",
+            (key, installed_base_name(key), entry.get("mod_name"), _encode(metadata)),
+        )
+        connection.executemany(
+            "INSERT INTO installed_paths (tracking_key, position, path) VALUES (?, ?, ?)",
+            [(key, position, path) for position, path in enumerate(entry.get("extracted_files", []))],
+        )
+
+
+# Tracked mods
+
+def load_tracked_mods():
+    """Return the cached tracked mods in the order they were saved."""
+    with _lock:
+        rows = _get_connection().execute("SELECT details FROM tracked_mods ORDER BY position").fetchall()
+    return [json.loads(details) for (details,) in rows]
+
+def _write_tracked_mods(connection, mods):
+    connection.executemany(
+        "INSERT OR REPLACE INTO tracked_mods (mod_id, position, name, details) VALUES (?, ?, ?, ?)",
+        [(mod.get("mod_id"), position, mod.get("name"), _encode(mod)) for position, mod in enumerate(mods)],
+    )
+
+
+# HTTP response cache
+
+def load_http_response(url):
+    """Return the cached response for a URL as a dict, or None if it is not cached."""
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT etag, last_modified, body, fetched_at FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+    if row is None:
+        return None
+    etag, last_modified, body, fetched_at = row
+    return {"etag": etag, "last_modified": last_modified, "body": body, "fetched_at": fetched_at}
+
+def save_http_response(url, etag, last_modified, body, fetched_at, max_entries):
+    """Store a response and evict the least recently used entries beyond `max_entries`."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, fetched_at, fetched_at),
+            )
+            connection.execute(
+                "DELETE FROM http_cache WHERE url NOT IN (SELECT url FROM http_cache ORDER BY accessed_at DESC LIMIT ?)",
+                (max_entries,),
+            )
+
+def touch_http_response(url, accessed_at, fetched_at=None):
+    """Mark a cached response as used, and as revalidated when `fetched_at` is given."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            if fetched_at is None:
+                connection.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (accessed_at, url))
+            else:
+                connection.execute(
+                    "UPDATE http_cache SET accessed_at = ?, fetched_at = ? WHERE url = ?", (accessed_at, fetched_at, url)
+                )
+
+
+# Download queue
+
+def add_download_job(game, mod_id, file_id, output_dir, label):
+    """Persist a queued download and return its job ID."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO download_queue (game, mod_id, file_id, output_dir, label) VALUES (?, ?, ?, ?, ?)",
+                (game, mod_id, file_id, output_dir, label),
+            )
+        return cursor.lastrowid
+
+def delete_download_job(job_id):
+    """Remove a download from the persistent queue once it finished or failed."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute("DELETE FROM download_queue WHERE job_id = ?", (job_id,))
+
+def load_download_jobs():
+    """Return the downloads left in the queue, oldest first."""
+    with _lock:
+        rows = _get_connection().execute(
+            "SELECT job_id, game, mod_id, file_id, output_dir, label FROM download_queue ORDER BY job_id"
+        ).fetchall()
+    return [
+        {"job_id": job_id, "game": game, "mod_id": mod_id, "file_id": file_id, "output_dir": output_dir, "label": label}
+        for job_id, game, mod_id, file_id, output_dir, label in rows
+    ]
+
+
+# Content store
+
+_STORED_CONTENT_COLUMNS = "sha256, md5, size, path, released_at"
+
+def save_stored_content(sha256, md5, size, path):
+    """Record where the content with this hash is stored."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO content_store (sha256, md5, size, path) VALUES (?, ?, ?, ?)",
+                (sha256, md5, size, path),
+            )
+
+def find_stored_content(md5):
+    """Return `{"sha256", "md5", "size", "path", "released_at"}` of stored content with this MD5, or None."""
+    with _lock:
+        row = _get_connection().execute(
+            f"SELECT {_STORED_CONTENT_COLUMNS} FROM content_store WHERE md5 = ?", (md5.lower(),)
+        ).fetchone()
+    return _stored_content(row)
+
+def get_stored_content(sha256):
+    with _lock:
+        row = _get_connection().execute(
+            f"SELECT {_STORED_CONTENT_COLUMNS} FROM content_store WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+    return _stored_content(row)
+
+def set_stored_content_released(sha256, released_at):
+    """Mark stored content as no longer linked by any download since `released_at`, or as in use again with None."""
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute("UPDATE content_store SET released_at = ? WHERE sha256 = ?", (released_at, sha256))
+
+def load_released_content():
+    """Return the stored content no download links to, the longest unused first."""
+    with _lock:
+        rows = _get_connection().execute(
+            f"SELECT {_STORED_CONTENT_COLUMNS} FROM content_store WHERE released_at IS NOT NULL ORDER BY released_at"
+        ).fetchall()
+    return [_stored_content(row) for row in rows]
+
+def delete_stored_content(sha256):
+    with _lock:
+        connection = _get_connection()
+        with connection:
+            connection.execute("DELETE FROM content_store WHERE sha256 = ?", (sha256,))
+
+def _stored_content(row):
+    return dict(zip(("sha256", "md5", "size", "path", "released_at"), row)) if row else None
@@ -0,0 +1,253 @@
+import os
+import atexit
+import logging
+import threading
+
+from src.config import Config
+from src.storage import database
+
+logger = logging.getLogger(__name__)
+
+# Parsed caches shared by the whole process, keyed by cache name
+_cache = {}
+_data_version = None
+_lock = threading.RLock()
+
+# Changes not yet written to the database: key -> new entry, or None for a removed key
+_pending = {"downloaded": {}, "installed": {}, "tracked": None}
+_flush_timer = None
+
+
+def _check_data_version():
+    """Drop every cache if another process committed to the database since they were loaded."""
+    global _data_version
+    version = database.data_version()
+    if version != _data_version:
+        if _cache:
+            logging.info("Database was changed by another process. Reloading caches.")
+            flush()  # Our own pending changes still win over the reloaded state
+        _cache.clear()
+        _data_version = version
+
+def _snapshot(name, loader):
+    """Return the in-memory copy of a cache, loading it only if it is missing or the database changed."""
+    with _lock:
+        _check_data_version()
+        if name not in _cache:
+            _cache[name] = loader()
+        return _cache[name]
+
+def _copy_entries(entries):
+    """Copy cache entries so callers can mutate their snapshot without touching the shared state."""
+    return {
+        key: {field: list(value) if isinstance(value, list) else value for field, value in entry.items()}
+        for key, entry in entries.items()
+    }
+
+def _mark_dirty(name, changes):
+    """Record changes for the next flush."""
+    _pending[name].update(changes)
+    _schedule_flush()
+
+def _schedule_flush():
+    """Start the debounce timer, coalescing bursts of writes into one transaction."""
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(Config.CACHE_FLUSH_DELAY, flush)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+def flush():
+    """Write all pending changes now. Called by the debounce timer and explicitly on shutdown."""
+    global _flush_timer
+    with _lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+
+        downloaded, installed, tracked = _pending["downloaded"], _pending["installed"], _pending["tracked"]
+        if not downloaded and not installed and tracked is None:
+            return
+
+        try:
+            database.write_changes(downloaded, installed, tracked)
+        except Exception as e:
+            logging.error(f"Error saving caches: {e}")
+            return  # Keep the changes pending so the next flush retries them
+
+        _pending.update(downloaded={}, installed={}, tracked=None)
+        logging.debug(f"Flushed {len(downloaded)} download and {len(installed)} install cache changes.")
+
+atexit.register(flush)
+
+
+# Downloaded files
+
+def load_downloaded_files():
+    """Return a snapshot of all downloaded file metadata keyed by file name."""
+    with _lock:  # Writers change the shared dict in place, so it is copied while they are held off
+        return _copy_entries(_snapshot("downloaded", database.load_downloaded_files))
+
+def upsert_downloaded_file(file_name, metadata):
+    """Insert or replace a single downloaded file entry."""
+    with _lock:
+        indexes = _download_indexes()
+        current = _snapshot("downloaded", database.load_downloaded_files)
+        _unindex_download(indexes, file_name, current.get(file_name))
+        current[file_name] = _copy_entries({file_name: metadata})[file_name]
+        _index_download(indexes, file_name, current[file_name])
+        _mark_dirty("downloaded", {file_name: current[file_name]})
+
+def update_downloaded_files(updates):
+    """Merge partial metadata updates (`{file_name: {field: value}}`) into the current entries."""
+    with _lock:
+        indexes = _download_indexes()
+        current = _snapshot("downloaded", database.load_downloaded_files)
+        changed = {name: {**current[name], **fields} for name, fields in updates.items() if name in current}
+        for file_name, metadata in changed.items():
+            _unindex_download(indexes, file_name, current[file_name])
+            _index_download(indexes, file_name, metadata)
+        current.update(changed)
+        _mark_dirty("downloaded", changed)
+
+def delete_downloaded_file(file_name):
+    """Remove a single downloaded file entry."""
+    with _lock:
+        indexes = _download_indexes()
+        current = _snapshot("downloaded", database.load_downloaded_files)
+        _unindex_download(indexes, file_name, current.pop(file_name, None))
+        _mark_dirty("downloaded", {file_name: None})
+
+def mod_file_states(mod_id):
+    """Return `{file_name: is_up_to_date}` for the downloaded files of a single mod."""
+    with _lock:
+        return dict(_download_indexes()["status"].get(mod_id, {}))
+
+def is_version_downloaded(file_name, uploaded_timestamp):
+    """
+    Check whether the remote file `file_name` uploaded at `uploaded_timestamp` (UTC epoch) has been downloaded.
+    Downloads are saved as `{file_name}_{YYYYMMDD_HHMMSS}.zip`, so their base name is the remote file name.
+    """
+    if not uploaded_timestamp:
+        return False
+    with _lock:
+        return (file_name, uploaded_timestamp) in _download_indexes()["versions"]
+
+def _download_indexes():
+    """
+    Indexes over the downloaded files, built once per snapshot and kept up to date by every change:
+    `status` maps mod_id -> {file_name: is_up_to_date}, and `versions` maps
+    (base name, upload epoch) -> file names.
+    """
+    if "download_indexes" not in _cache:
+        indexes = {"status": {}, "versions": {}}
+        for file_name, metadata in _snapshot("downloaded", database.load_downloaded_files).items():
+            _index_download(indexes, file_name, metadata)
+        _cache["download_indexes"] = indexes
+    return _cache["download_indexes"]
+
+def _index_download(indexes, file_name, metadata):
+    up_to_date = metadata.get("latest_downloaded_timestamp") == metadata.get("latest_uploaded_timestamp")
+    indexes["status"].setdefault(metadata.get("mod_id"), {})[file_name] = up_to_date
+
+    version = (database.download_base_name(file_name), database.download_timestamp(file_name))
+    indexes["versions"].setdefault(version, set()).add(file_name)
+
+def _unindex_download(indexes, file_name, metadata):
+    if metadata is None:
+        return
+    mod_files = indexes["status"].get(metadata.get("mod_id"), {})
+    mod_files.pop(file_name, None)
+    if not mod_files:
+        indexes["status"].pop(metadata.get("mod_id"), None)
+
+    version = (database.download_base_name(file_name), database.download_timestamp(file_name))
+    version_files = indexes["versions"].get(version, set())
+    version_files.discard(file_name)
+    if not version_files:
+        indexes["versions"].pop(version, None)
+
+
+# Installed files
+
+def load_installed_files():
+    """Return a snapshot of installed mod entries keyed by tracking key."""
+    with _lock:  # Writers change the shared dict in place, so it is copied while they are held off
+        return _copy_entries(_snapshot("installed", database.load_installed_files))
+
+def upsert_installed_file(tracking_key, entry):
+    """Insert or replace a single installed mod entry."""
+    with _lock:
+        index = _installed_index()
+        current = _snapshot("installed", database.load_installed_files)
+        if tracking_key not in current:
+            index.setdefault(database.installed_base_name(tracking_key), []).append(tracking_key)
+        current[tracking_key] = _copy_entries({tracking_key: entry})[tracking_key]
+        _mark_dirty("installed", {tracking_key: current[tracking_key]})
+
+def delete_installed_file(tracking_key):
+    """Remove a single installed mod entry."""
+    with _lock:
+        index = _installed_index()
+        current = _snapshot("installed", database.load_installed_files)
+        if current.pop(tracking_key, None) is not None:
+            base_name = database.installed_base_name(tracking_key)
+            index[base_name].remove(tracking_key)
+            if not index[base_name]:
+                del index[base_name]
+        _mark_dirty("installed", {tracking_key: None})
+
+def find_installed_key(file_name):
+    """Return the tracking key installed under the same name as `file_name`, ignoring extensions, or None."""
+    with _lock:
+        keys = _installed_index().get(database.installed_base_name(file_name))
+        return keys[0] if keys else None
+
+def _installed_index():
+    """Base name -> tracking keys index over the installed files, built once per snapshot and kept up to date."""
+    if "installed_index" not in _cache:
+        index = {}
+        for tracking_key in _snapshot("installed", database.load_installed_files):
+            index.setdefault(database.installed_base_name(tracking_key), []).append(tracking_key)
+        _cache["installed_index"] = index
+    return _cache["installed_index"]
+
+def rename_installed_path(old_name, new_path):
+    """Point every installed path whose file name is `old_name` at `new_path`. Returns True if a path was updated."""
+    with _lock:
+        current = _snapshot("installed", database.load_installed_files)
+        changed = {}
+        for key, entry in current.items():
+            paths = entry.get("extracted_files", [])
+            if any(os.path.basename(path) == old_name for path in paths):
+                entry["extracted_files"] = [new_path if os.path.basename(path) == old_name else path for path in paths]
+                changed[key] = entry
+        _mark_dirty("installed", changed)
+        return bool(changed)
+
+def list_installed_paths(suffix=""):
+    """Return installed file paths, optionally limited to those with the given suffix (case-insensitive)."""
+    suffix = suffix.lower()
+    with _lock:
+        return [
+            path
+            for entry in _snapshot("installed", database.load_installed_files).values()
+            for path in entry.get("extracted_files", [])
+            if path.lower().endswith(suffix)
+        ]
+
+
+# Tracked mods
+
+def load_tracked_mods():
+    """Return a snapshot of the cached tracked mods."""
+    with _lock:
+        return [dict(mod) for mod in _snapshot("tracked", database.load_tracked_mods)]
+
+def save_tracked_mods(mods):
+    """Replace the cached tracked mods."""
+    with _lock:
+        _check_data_version()
+        _cache["tracked"] = [dict(mod) for mod in mods]
+        _pending["tracked"] = _cache["tracked"]
+        _schedule_flush()
@@ -4,4 +4,5 @@ from .results_tab import create_results_panel
 from .settings_panel import create_settings_panel
 from .populate_results import populate_results_list
 from .modify_files import show_modify_files_popup
-from .file_selection import show_file_selection_popup
\ No newline at end of file
+from .file_selection import show_file_selection_popup
+from .tasks_panel import create_tasks_panel
\ No newline at end of file
@@ -1,43 +1,63 @@
-from datetime import datetime
-from tkinter import ttk, IntVar, Checkbutton, messagebox, Toplevel, DISABLED
+from tkinter import ttk, IntVar, Checkbutton, Label, messagebox, Toplevel, DISABLED
 
 from src.api import get_mod_files
+from src.core import run_task, cancel_task
 from src.utils import _create_scrollable_frame, _close_popup, _clean_description, \
-    _format_timestamp, _load_download_cache, _parse_file_timestamp
+    _format_timestamp, _is_version_downloaded
 
 
 def show_file_selection_popup(game, mod_id, on_files_selected):
-    """Show a popup menu with file options for the selected mod."""
+    """Show a popup menu with file options for the selected mod. The file list is fetched in a background task."""
     popup = Toplevel()
     popup.title("Select Files to Download")
     popup.geometry("400x600")
 
-    # Create a scrollable frame
-    scrollable_frame = _create_scrollable_frame(popup)
+    loading_label = Label(popup, text="Loading files...")
+    loading_label.pack(pady=20)
 
-    # Fetch files for the mod
-    files = get_mod_files(game, mod_id)
-    if not files:
-        messagebox.showinfo("No Files", "No files found for this mod.")
-        popup.destroy()
-        return
+    def on_files_loaded(files):
+        if not popup.winfo_exists():
+            return  # Closed while the files were loading
+        loading_label.destroy()
+
+        if not files:
+            messagebox.showinfo("No Files", "No files found for this mod.")
+            popup.destroy()
+            return
+
+        # Create a scrollable frame
+        scrollable_frame = _create_scrollable_frame(popup)
+
+        # Sort files by upload timestamp in descending order
+        files = sorted(files, key=lambda x: x.get("uploaded_timestamp", 0), reverse=True)
+
+        # Create checkboxes for each file
+        file_vars = _create_file_checkboxes(scrollable_frame, files)
+
+        # Add "Download" button
+        download_button = ttk.Button(
+            popup,
+            text="Download Selected Files",
+            command=lambda: _handle_file_selection(file_vars, popup, on_files_selected),
+        )
+        download_button.pack(pady=10)
+
+        # Handle the case when the popup is closed without selecting files
+        popup.protocol("WM_DELETE_WINDOW", lambda: _close_popup(popup, download_button))
 
-    # Sort files by upload timestamp in descending order
-    files = sorted(files, key=lambda x: x.get("uploaded_timestamp", 0), reverse=True)
+    def on_error(error):
+        if popup.winfo_exists():
+            popup.destroy()
+        messagebox.showerror("Error", f"Failed to load files: {error}")
 
-    # Create checkboxes for each file
-    file_vars = _create_file_checkboxes(scrollable_frame, files)
+    # Fetch files for the mod
+    task_id = run_task(f"Load files of mod {mod_id}", lambda task: get_mod_files(game, mod_id), on_files_loaded, on_error)
 
-    # Add "Download" button
-    download_button = ttk.Button(
-        popup,
-        text="Download Selected Files",
-        command=lambda: _handle_file_selection(file_vars, popup, on_files_selected),
-    )
-    download_button.pack(pady=10)
+    def close_while_loading():
+        cancel_task(task_id)
+        popup.destroy()
 
-    # Handle the case when the popup is closed without selecting files
-    popup.protocol("WM_DELETE_WINDOW", lambda: _close_popup(popup, download_button))
+    popup.protocol("WM_DELETE_WINDOW", close_while_loading)
 
     # Make the popup modal
     popup.grab_set()
@@ -45,15 +65,11 @@ def show_file_selection_popup(game, mod_id, on_files_selected):
 
 def _create_file_checkboxes(scrollable_frame, files):
     """Create checkboxes for files, ensuring only one checkbox per base file name can be selected.
-       Also indicates which files have already been downloaded using the download cache.
+       Also indicates which files have already been downloaded, using the download cache's version index.
     """
     file_vars = {}
     selected_base_files = set()  # Track selected base file names
 
-    # Load downloaded files cache
-    downloaded_cache = _load_download_cache()
-    downloaded_files = downloaded_cache.get("files", {})
-
     def toggle_checkbox(file_id, base_name, var):
         """Callback to enforce unique base file selection."""
         if var.get() == 1:  # Checkbox is being selected
@@ -78,21 +94,8 @@ def _create_file_checkboxes(scrollable_frame, files):
         # Extract the base file name (before timestamp or version info)
         base_name = file_name.split("_")[0]
 
-        # Convert the mod file's uploaded_timestamp to a full datetime object (UTC)
-        mod_uploaded_timestamp = file.get("uploaded_timestamp")
-        mod_uploaded_dt = (
-            datetime.utcfromtimestamp(mod_uploaded_timestamp) if mod_uploaded_timestamp else None
-        )
-
-        # Check if a downloaded file exists that matches both the base name and the full timestamp.
-        already_downloaded = False
-        for downloaded_file in downloaded_files.keys():
-            # Check if the downloaded file has the same base name
-            if downloaded_file.startswith(base_name):
-                downloaded_dt = _parse_file_timestamp(downloaded_file)
-                if downloaded_dt and mod_uploaded_dt and downloaded_dt == mod_uploaded_dt:
-                    already_downloaded = True
-                    break
+        # Check if this exact file name and upload time has already been downloaded
+        already_downloaded = _is_version_downloaded(file_name, file.get("uploaded_timestamp"))
 
         # Update the label to indicate if the file is already downloaded.
         file_label = (
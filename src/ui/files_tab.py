@@ -1,6 +1,6 @@
 from tkinter import ttk
 
-from src.utils import _load_download_cache, _load_installed_files, _find_matching_installed_file, _sort_treeview
+from src.utils import _load_download_cache, _find_matching_installed_file, _sort_treeview
 
 
 def create_file_list(files_frame):
@@ -40,7 +40,6 @@ def populate_file_list(files_tree):
     files_tree.delete(*files_tree.get_children())  # Clear previous entries
 
     downloaded_files = _load_download_cache()
-    installed_files = _load_installed_files()  # Load installed mods tracking
     files_data = []
 
     for file_name, metadata in downloaded_files.get("files", {}).items():
@@ -49,7 +48,7 @@ def populate_file_list(files_tree):
         uploaded_time = metadata.get("latest_uploaded_timestamp", "Unknown")
 
         # Determine installation status, ignoring file extensions
-        install_status = "Installed" if _find_matching_installed_file(file_name, installed_files) else "Not Installed"
+        install_status = "Installed" if _find_matching_installed_file(file_name) else "Not Installed"
 
         files_data.append((mod_name, file_name, f"{file_size:.2f} MB", uploaded_time, install_status))
 
@@ -1,7 +1,7 @@
 from src.utils import _group_mods_by_category, _configure_treeview_tags, _compare_mod_status
 
 
-def populate_results_list(results_tree, mods, downloaded_files):
+def populate_results_list(results_tree, mods):
     """Populate the Treeview with mod details, keeping categories sorted alphabetically and mods sorted within categories."""
     results_tree.delete(*results_tree.get_children())  # Clear the Treeview
 
@@ -33,7 +33,7 @@ def populate_results_list(results_tree, mods, downloaded_files):
             mod_id = mod.get("mod_id", "Unknown ID")
 
             # Calculate mod status
-            status = _compare_mod_status(mod, downloaded_files.get("files", {}))
+            status = _compare_mod_status(mod)
 
             # Determine the tag based on status
             tag = {
@@ -0,0 +1,35 @@
+from tkinter import ttk
+
+from src.core import cancel_task
+from src.utils import subscribe_progress
+
+
+def create_tasks_panel(root):
+    """Show the running background tasks at the bottom of the main window, with a button to cancel one."""
+    frame = ttk.LabelFrame(root, text="Background Tasks")
+    frame.pack(side="bottom", fill="x", padx=10, pady=5)
+
+    tasks_tree = ttk.Treeview(frame, columns=("Task", "Status"), show="headings", height=3)
+    tasks_tree.heading("Task", text="Task")
+    tasks_tree.heading("Status", text="Status")
+    tasks_tree.column("Task", width=400, anchor="w")
+    tasks_tree.column("Status", width=300, anchor="w")
+    tasks_tree.pack(side="left", fill="x", expand=True, padx=5, pady=5)
+
+    def cancel_selected():
+        for item in tasks_tree.selection():
+            cancel_task(int(item))
+
+    ttk.Button(frame, text="Cancel Task", command=cancel_selected).pack(side="right", padx=5)
+
+    def on_tasks(tasks):
+        """Mirror the task list; called on the Tk thread."""
+        selected = set(tasks_tree.selection())
+        tasks_tree.delete(*tasks_tree.get_children())
+        for task in tasks:
+            status = f"{task['status']}: {task['detail']}" if task["detail"] else task["status"]
+            tasks_tree.insert("", "end", iid=str(task["task_id"]), values=(task["name"], status))
+        tasks_tree.selection_set([item for item in selected if tasks_tree.exists(item)])
+
+    subscribe_progress("tasks", on_tasks)
+    return tasks_tree
@@ -4,7 +4,7 @@ from tkinter import ttk
 from typing import Optional
 
 from src.ui import populate_results_list, populate_file_list
-from src.utils import _load_tracked_mods_cache, _load_download_cache, _list_installed_archives
+from src.utils import _load_tracked_mods_cache, _list_installed_archives
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,6 @@ def refresh_results(results_tree: ttk.Treeview, progress_label: Optional[tk.Labe
     try:
         # Reload the caches
         tracked_mods = _load_tracked_mods_cache()
-        downloaded_files = _load_download_cache()
 
         if not tracked_mods:
             logging.info("No tracked mods found in cache.")
@@ -27,7 +26,7 @@ def refresh_results(results_tree: ttk.Treeview, progress_label: Optional[tk.Labe
             return
 
         # Repopulate the results tree
-        populate_results_list(results_tree, tracked_mods, downloaded_files)
+        populate_results_list(results_tree, tracked_mods)
 
         if progress_label:
             progress_label.config(text="Refresh complete.")
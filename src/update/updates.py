@@ -1,92 +1,162 @@
 import logging
+import time
 import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from src.api import get_mod_files
-from src.utils import _save_download_cache
+from src.api import get_mod_files, get_updated_mods, request_priority, run_bulk, probe, BACKGROUND
+from src.config import Config
+from src.storage import update_downloaded_files, load_meta, save_meta, flush
+from src.utils import publish_progress, subscribe_progress, unsubscribe_progress
 
 logger = logging.getLogger(__name__)
 
-def start_update_thread(root, downloaded_files, update_popup):
+def start_update_thread(downloaded_files, update_popup):
     """Runs update check in a background thread and closes popup after completion."""
+    def on_progress(checked, total, finished=False):
+        """Receives the check's progress events on the Tk thread."""
+        if finished:
+            unsubscribe_progress("updates", on_progress)
+            update_popup.destroy()
+        elif update_popup.winfo_exists():
+            update_popup.title(f"Checking for Updates ({checked}/{total})")
+
     def run_updates():
         try:
+            if not probe():
+                logging.info("Offline. Skipping the update check; cached data is shown.")
+                return
             logging.info("Checking for mod updates...")
-            check_for_updates(downloaded_files)
+            check_for_updates(downloaded_files, lambda checked, total: publish_progress("updates", checked, total))
         except Exception as e:
             logging.error(f"Error during update check: {e}")
         finally:
-            root.after(0, update_popup.destroy)
+            publish_progress("updates", None, None, True, final=True)
 
+    subscribe_progress("updates", on_progress)
     threading.Thread(target=run_updates, daemon=True).start()
 
-def check_for_updates(downloaded_files):
+def check_for_updates(downloaded_files, progress_callback=None):
     """
     Update latest_uploaded_timestamp for each mod in the downloaded files cache.
-    This version uses ThreadPoolExecutor to fetch mod file metadata concurrently,
-    making the update process faster by overlapping network I/O.
+    `progress_callback(checked, total)` is called from the worker threads as each mod is checked, including
+    mods whose fetch failed.
+    Only mods listed in the "updated mods" feed since the last successful check are fetched; a full scan
+    runs when there is no previous check or it is older than the feed covers.
+    Mod file metadata is fetched concurrently with the bulk engine, once per distinct mod.
     """
     logging.info("Starting to check for updates to mods in the cache.")
 
+    started_at = time.time()
     files_cache = downloaded_files.get("files", {})
     total_mods = len(files_cache)
     updated_mods = 0
+    updates = {}
 
-    def process_mod(file_name, metadata):
-        mod_name = metadata.get("mod_name")
-        mod_id = metadata.get("mod_id")
+    changed_mod_ids = _get_changed_mod_ids(started_at)
+    if changed_mod_ids is None:
+        logging.info("Running a full update scan.")
+        files_to_check = files_cache
+        max_age = None
+    else:
+        files_to_check = {
+            file_name: metadata for file_name, metadata in files_cache.items()
+            if metadata.get("mod_id") in changed_mod_ids
+        }
+        max_age = 0  # The feed says these changed, so revalidate any cached file list
+        logging.info(f"{len(changed_mod_ids)} mods were updated since the last check; checking {len(files_to_check)} files.")
 
+    # Group files by mod so each mod's file list is fetched once, however many of its files were downloaded
+    files_by_mod = {}
+    for file_name, metadata in files_to_check.items():
+        mod_id = metadata.get("mod_id")
         if not mod_id:
             logging.warning(f"Mod ID missing for file {file_name}. Skipping update.")
-            return file_name, None
+            continue
+        files_by_mod.setdefault(mod_id, []).append(file_name)
 
-        files = get_mod_files("cyberpunk2077", mod_id)
-        if not files:
-            return file_name, None
+    checked_mods = 0
+    checked_lock = threading.Lock()
 
-        # Determine the latest uploaded timestamp from the returned files.
+    def process_mod(mod_id):
+        nonlocal checked_mods
         try:
-            latest_timestamp = max(file.get("uploaded_timestamp", 0) for file in files)
-        except ValueError:
-            # max() may fail if files is empty
-            latest_timestamp = 0
+            return _latest_upload(mod_id)
+        finally:
+            # Counted here rather than in `apply_update`, which run_bulk skips for failed mods
+            with checked_lock:
+                checked_mods += 1
+                checked = checked_mods
+            if progress_callback:
+                progress_callback(checked, len(files_by_mod))
 
+    def _latest_upload(mod_id):
+        # Update checks yield to requests made for the user and pause first when the quota runs low
+        with request_priority(BACKGROUND):
+            # A failed fetch raises, so run_bulk records it and the watermark stays put
+            files = get_mod_files("cyberpunk2077", mod_id, max_age, raise_errors=True)
+        if not files:
+            return None
+
+        # Determine the latest uploaded timestamp from the returned files.
+        latest_timestamp = max(file.get("uploaded_timestamp", 0) for file in files)
         if latest_timestamp > 0:
-            new_timestamp = datetime.utcfromtimestamp(latest_timestamp).strftime("%Y-%m-%d %H:%M:%S")
-            old_timestamp = metadata.get("latest_uploaded_timestamp", "Unknown")
+            return datetime.utcfromtimestamp(latest_timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+        logging.warning(f"Could not determine latest uploaded timestamp for mod ID {mod_id}.")
+        return None
+
+    def apply_update(mod_id, new_timestamp):
+        nonlocal updated_mods
+        if new_timestamp is None:
+            return
+        for file_name in files_by_mod[mod_id]:
+            old_timestamp = files_cache[file_name].get("latest_uploaded_timestamp", "Unknown")
             if new_timestamp != old_timestamp:
                 logging.info(
                     f"Found an update for {file_name}: "
                     f"Current file date: {old_timestamp} -> Updated to: {new_timestamp}."
                 )
-                return file_name, new_timestamp
-            else:
-                return file_name, None
-        else:
-            logging.warning(f"Could not determine latest uploaded timestamp for {mod_name} (ID: {mod_id}).")
-            return file_name, None
-
-    # Use a thread pool to process mods concurrently.
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_file = {
-            executor.submit(process_mod, file_name, metadata): file_name
-            for file_name, metadata in files_cache.items()
-        }
+                files_cache[file_name]["latest_uploaded_timestamp"] = new_timestamp
+                updates[file_name] = {"latest_uploaded_timestamp": new_timestamp}
+                updated_mods += 1
 
-        for future in as_completed(future_to_file):
-            file_name = future_to_file[future]
-            try:
-                mod_file, new_timestamp = future.result()
-                if new_timestamp is not None:
-                    files_cache[mod_file]["latest_uploaded_timestamp"] = new_timestamp
-                    updated_mods += 1
-            except Exception as e:
-                logging.error(f"Error updating mod {file_name}: {e}")
+    # Process mods concurrently, applying each result as it arrives.
+    _, errors = run_bulk(list(files_by_mod), process_mod, on_result=apply_update)
+    failed = bool(errors)
 
-    # Save the updated cache after processing all mods.
-    _save_download_cache(downloaded_files)
+    # Save only the changed entries after processing all mods, and write them before the watermark moves.
+    update_downloaded_files(updates)
+    flush()
+
+    # Move the watermark only when every mod was checked, so failed mods are retried next time
+    if not failed:
+        save_meta("updates_checked_at", started_at)
 
     logging.info(
         f"Completed update check. {updated_mods} out of {total_mods} mods were updated in the cache."
-    )
\ No newline at end of file
+    )
+
+def _get_changed_mod_ids(now):
+    """
+    Return the IDs of mods updated since the last successful check, using the smallest feed period
+    that covers it, or None when a full scan is needed.
+    """
+    last_checked = load_meta("updates_checked_at")
+    if last_checked is None:
+        return None
+
+    elapsed = now - float(last_checked)
+    period = next((name for name, seconds in Config.UPDATE_FEED_PERIODS if elapsed <= seconds), None)
+    if period is None:
+        logging.info("Last update check is older than the updated mods feed covers.")
+        return None
+
+    with request_priority(BACKGROUND):
+        updated_mods = get_updated_mods("cyberpunk2077", period)
+    if updated_mods is None:
+        return None
+
+    return {
+        mod.get("mod_id") for mod in updated_mods
+        if mod.get("latest_file_update", 0) >= float(last_checked)
+    }
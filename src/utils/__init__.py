@@ -1,18 +1,21 @@
 from .file_handling import (
     _load_download_cache,
-    _save_download_cache,
     _load_installed_files,
-    _save_installed_files,
+    _track_installed_file,
+    _untrack_installed_file,
     _load_tracked_mods_cache,
+    _save_tracked_mods_cache,
     _setup_mod_directory,
     _clean_directory,
     _find_matching_installed_file,
+    _is_version_downloaded,
     _list_installed_archives,
     _rename_archive,
     _parse_file_timestamp,
 )
 from .api import _get_file_details
 from .download import _download_file, _prepare_file_for_download
+from .content_store import _store_download, _restore_from_store, _release_from_store
 from .gui import (
     _create_scrollable_frame,
     _close_popup,
@@ -31,12 +34,16 @@ from .gui import (
 )
 from .install import (
     _extract_common,
+    _build_install_manifest,
     _find_deepest_valid_folder,
-    _extract_zip,
-    _extract_rar,
+    _plan_zip,
+    _stream_zip_members,
+    _stage_rar,
+    _install_from_staging,
     _move_relevant_folders,
     _list_files_recursive,
     _validate_installation_settings
 )
 from .uninstall import _remove_file_safely, _find_matching_mod
 from .logging import configure_logging
+from .progress import publish_progress, subscribe_progress, unsubscribe_progress, start_progress_pump
@@ -0,0 +1,127 @@
+import os
+import time
+import shutil
+import logging
+
+from src.config import Config
+from src.storage import database
+
+logger = logging.getLogger(__name__)
+
+
+def _content_path(output_dir, sha256):
+    """Path of a stored archive inside the content store: `<output_dir>/.store/ab/abcdef...`."""
+    return os.path.join(output_dir, Config.CONTENT_STORE_DIR, sha256[:2], sha256)
+
+def _store_download(file_path, hashes, output_dir):
+    """
+    Keep a downloaded archive once per content hash. If the same content is already stored, `file_path`
+    becomes a hardlink to it and the duplicate's space is freed; otherwise the new file is linked into the store.
+    When the filesystem has no hardlinks, the file stays where it is and the store only records its path.
+    """
+    stored_path = _content_path(output_dir, hashes["sha256"])
+    if os.path.exists(stored_path):
+        if not os.path.samefile(stored_path, file_path):
+            _replace_with_link(stored_path, file_path)
+        database.set_stored_content_released(hashes["sha256"], None)
+        return
+
+    try:
+        os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+        os.link(file_path, stored_path)
+    except OSError as e:
+        logging.debug(f"Hardlinks unavailable for the content store ({e}). Recording the file path instead.")
+        stored_path = file_path
+
+    database.save_stored_content(hashes["sha256"], hashes["md5"], os.path.getsize(file_path), stored_path)
+
+def _replace_with_link(stored_path, file_path):
+    """
+    Swap `file_path` for a hardlink to the stored copy of the same content. The link is made under a temporary
+    name and renamed over the file, so the download is kept as it is if linking fails.
+    """
+    temp_path = f"{file_path}.link"
+    try:
+        os.link(stored_path, temp_path)
+        os.replace(temp_path, file_path)
+        logging.info(f"♻️ '{os.path.basename(file_path)}' was already stored. Linked it instead of keeping a copy.")
+    except OSError as e:
+        logging.debug(f"Could not link '{file_path}' to the content store ({e}). Keeping the downloaded copy.")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _restore_from_store(md5, file_path, expected_size=None):
+    """
+    Place already stored content with this MD5 (and `expected_size`, when given) at `file_path` (a hardlink,
+    or a copy without hardlink support) instead of downloading it again.
+    Returns the content's hashes, or None if it isn't stored.
+    """
+    if not md5:
+        return None
+    stored = database.find_stored_content(md5)
+    if not stored or not os.path.exists(stored["path"]):
+        return None
+    # An MD5 match alone isn't trusted: the stored file must also have the size the API reports
+    actual_size = os.path.getsize(stored["path"])
+    if actual_size != stored["size"] or (expected_size and actual_size != expected_size):
+        logging.warning(f"Stored content for '{os.path.basename(file_path)}' has the wrong size. Downloading it instead.")
+        return None
+
+    if not (os.path.exists(file_path) and os.path.samefile(stored["path"], file_path)):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        try:
+            os.link(stored["path"], file_path)
+        except OSError:
+            shutil.copy2(stored["path"], file_path)
+        logging.info(f"♻️ Reused stored content for '{os.path.basename(file_path)}' instead of downloading it.")
+
+    if stored["released_at"] is not None:
+        database.set_stored_content_released(stored["sha256"], None)
+    return {"md5": stored["md5"], "sha256": stored["sha256"]}
+
+def _release_from_store(sha256s):
+    """
+    Check the stored archives with these hashes after downloads linking to them were removed.
+    An archive no download links to anymore is kept, so deleting and downloading a file again reuses it,
+    until the unused archives together exceed `Config.CONTENT_STORE_UNUSED_LIMIT`.
+    """
+    for sha256 in set(filter(None, sha256s)):
+        stored = database.get_stored_content(sha256)
+        if not stored:
+            continue
+        path = stored["path"]
+        try:
+            if not os.path.exists(path):
+                database.delete_stored_content(sha256)
+            # A stored archive is only referenced by its own link once every downloaded copy is gone
+            elif _in_store(path) and os.stat(path).st_nlink <= 1 and stored["released_at"] is None:
+                database.set_stored_content_released(sha256, time.time())
+        except OSError as e:
+            logging.error(f"Error checking content store entry '{path}': {e}")
+
+    _evict_unused_content()
+
+def _evict_unused_content():
+    """Remove the longest unused stored archives until the unused ones fit `Config.CONTENT_STORE_UNUSED_LIMIT`."""
+    released = database.load_released_content()
+    unused_size = sum(stored["size"] for stored in released)
+    for stored in released:
+        if unused_size <= Config.CONTENT_STORE_UNUSED_LIMIT:
+            break
+        path = stored["path"]
+        try:
+            if os.path.exists(path):
+                if os.stat(path).st_nlink > 1:
+                    database.set_stored_content_released(stored["sha256"], None)  # Linked again in the meantime
+                    unused_size -= stored["size"]
+                    continue
+                os.remove(path)
+                logging.info(f"Removed unused archive from the content store: {path}")
+            database.delete_stored_content(stored["sha256"])
+            unused_size -= stored["size"]
+        except OSError as e:
+            logging.error(f"Error removing content store entry '{path}': {e}")
+
+def _in_store(path):
+    """Whether `path` is a blob inside a content store rather than a download recorded without hardlinks."""
+    return os.path.basename(os.path.dirname(os.path.dirname(path))) == Config.CONTENT_STORE_DIR
@@ -1,26 +1,277 @@
 import os
+import json
+import hashlib
+import logging
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from src.api import download_get
+from src.config import Config
 
-def _download_file(url, file_path, progress_callback=None):
-    """Download a file from the given URL to the specified file path."""
-    response = requests.get(url, stream=True)
-    total_size = int(response.headers.get('Content-Length', 0))  # Total size in bytes
-    downloaded_size = 0
+logger = logging.getLogger(__name__)
 
-    with open(file_path, "wb") as file:
-        for chunk in response.iter_content(chunk_size=1024 * 1024):  # 1 MB chunks
-            if chunk:
-                file.write(chunk)
-                downloaded_size += len(chunk)
 
-                if progress_callback and total_size > 0:
-                    percent_complete = (downloaded_size / total_size) * 100
-                    progress_callback(percent_complete, downloaded_size / (1024 * 1024), total_size / (1024 * 1024))
+class _RangeNotSupported(Exception):
+    """The download host ignored a Range request, so the file can't be fetched in segments."""
 
 
+def _download_file(url, file_path, progress_callback=None, expected_size=None, expected_md5=None):
+    """
+    Download a file from the given URL to the specified file path.
+    Data goes to `file_path.part`, which is resumed with a Range request after a dropped connection or an app
+    restart. The finished file is checked against `expected_size` / `expected_md5` when given and only then
+    renamed into place, so `file_path` never holds a partial download.
+    Files of at least `SEGMENTED_DOWNLOAD_THRESHOLD` bytes are fetched as several byte ranges in parallel,
+    falling back to a single stream when the host doesn't support ranges.
+    Returns the file's `{"md5": ..., "sha256": ...}` hex digests.
+    """
+    part_path = f"{file_path}.part"
+    segmented = bool(expected_size) and expected_size >= Config.SEGMENTED_DOWNLOAD_THRESHOLD
+    for attempt in range(Config.DOWNLOAD_RETRIES + 1):
+        try:
+            if segmented:
+                try:
+                    digests = _download_segmented(url, part_path, expected_size, progress_callback)
+                    break
+                except _RangeNotSupported:
+                    logging.info("Download host doesn't support ranges. Falling back to a single stream.")
+                    segmented = False
+                    _remove_segmented_part(part_path)
+            digests = _download_to_part(url, part_path, progress_callback)
+            break
+        except requests.RequestException as e:
+            if attempt == Config.DOWNLOAD_RETRIES:
+                raise
+            logging.warning(f"Download of '{os.path.basename(file_path)}' interrupted ({e}). Resuming...")
+
+    hashes = {name: digest.hexdigest() for name, digest in digests.items()}
+    _validate_download(part_path, hashes, expected_size, expected_md5)
+    os.replace(part_path, file_path)
+    return hashes
+
+def _download_to_part(url, part_path, progress_callback=None):
+    """
+    Download into a .part file, continuing from its current size when the server honours Range.
+    Chunks are hashed as they are written; only the bytes kept from an earlier attempt are read back.
+    Returns the MD5 and SHA-256 digest objects of the whole file.
+    """
+    resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+    digests = _new_digests()
+
+    # Closing the response hands the connection back to the shared pool for the next download
+    with download_get(url, headers=headers) as response:
+        if response.status_code == 416:
+            return _hash_file(part_path, digests)  # The .part file already holds the whole file
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            logging.info(f"Resuming download at {resume_from / (1024 * 1024):.1f} MB.")
+            _hash_file(part_path, digests)
+        else:
+            resume_from = 0  # Range ignored: start over
+
+        total_size = int(response.headers.get('Content-Length', 0)) + resume_from  # Total size in bytes
+        downloaded_size = resume_from
+
+        with open(part_path, "ab" if resume_from else "wb") as file:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):  # 1 MB chunks
+                if chunk:
+                    file.write(chunk)
+                    for digest in digests.values():
+                        digest.update(chunk)
+                    downloaded_size += len(chunk)
+
+                    if progress_callback and total_size > 0:
+                        percent_complete = (downloaded_size / total_size) * 100
+                        progress_callback(percent_complete, downloaded_size / (1024 * 1024), total_size / (1024 * 1024))
+
+    return digests
+
+def _new_digests():
+    return {"md5": hashlib.md5(), "sha256": hashlib.sha256()}
+
+def _hash_file(path, digests):
+    """Feed a file's contents into the given digests and return them."""
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            for digest in digests.values():
+                digest.update(chunk)
+    return digests
+
+def _download_segmented(url, part_path, total_size, progress_callback=None):
+    """
+    Download `total_size` bytes as `DOWNLOAD_SEGMENTS` byte ranges over parallel connections, each written at its
+    own offset of a preallocated .part file. Segment progress is saved next to the .part file every
+    `DOWNLOAD_SEGMENT_SAVE_CHUNKS` chunks and when a transfer fails, so the next attempt (even after the app was
+    closed or crashed) only fetches what is missing.
+    The file is hashed in order as its contiguous prefix grows: chunks written at the end of the prefix are hashed
+    from memory, and only bytes that arrived ahead of it (later segments, or data kept from an earlier attempt)
+    are read back from disk, while the other segments are still downloading.
+    Returns the MD5 and SHA-256 digest objects of the whole file.
+    """
+    segments = _load_segments(part_path, total_size)
+    if segments is None:
+        _probe_ranges(url, total_size)
+        segment_size = -(-total_size // Config.DOWNLOAD_SEGMENTS)  # Ceiling division
+        segments = {start: [min(start + segment_size, total_size) - 1, 0] for start in range(0, total_size, segment_size)}
+        with open(part_path, "wb") as file:
+            file.truncate(total_size)  # Preallocate so every segment can write at its offset
+
+    lock = threading.Lock()
+    downloaded = [sum(done for _, done in segments.values())]
+    unsaved_chunks = [0]
+    hasher = _PrefixHasher(part_path, segments, lock)
+
+    def fetch(start):
+        end, done = segments[start]
+        if start + done > end:
+            return
+        with download_get(url, headers={"Range": f"bytes={start + done}-{end}"}) as response:
+            if response.status_code != 206:
+                raise _RangeNotSupported()
+            with open(part_path, "r+b") as file:
+                file.seek(start + done)
+                for chunk in response.iter_content(chunk_size=1024 * 1024):  # 1 MB chunks
+                    if chunk:
+                        position = file.tell()
+                        file.write(chunk)
+                        file.flush()  # Saved progress and the hasher never count bytes still in Python's buffer
+                        with lock:
+                            segments[start][1] += len(chunk)
+                            downloaded[0] += len(chunk)
+                            unsaved_chunks[0] += 1
+                            if unsaved_chunks[0] >= Config.DOWNLOAD_SEGMENT_SAVE_CHUNKS:
+                                _save_segments(part_path, segments)
+                                unsaved_chunks[0] = 0
+                            if progress_callback:
+                                progress_callback(downloaded[0] / total_size * 100,
+                                                  downloaded[0] / (1024 * 1024), total_size / (1024 * 1024))
+                        hasher.advance(chunk, position)
+
+    with ThreadPoolExecutor(max_workers=Config.DOWNLOAD_SEGMENTS) as executor:
+        futures = [executor.submit(fetch, start) for start in segments]
+        errors = [future.exception() for future in futures if future.exception()]
+
+    if errors:
+        _save_segments(part_path, segments)
+        raise errors[0]
+    _remove_file(f"{part_path}.segments")
+    hasher.advance()  # Hash whatever finished ahead of the prefix after its last chunk arrived
+    return hasher.digests
+
+class _PrefixHasher:
+    """
+    Hashes a segmented download in file order while its segments are still arriving.
+    Only one thread hashes at a time; the others just record their progress in `segments` and carry on.
+    """
+
+    def __init__(self, part_path, segments, lock):
+        self.part_path = part_path
+        self.segments = segments
+        self.lock = lock  # The segment lock, which guards `segments`
+        self.digests = _new_digests()
+        self.hashed = 0
+        self.hashing = False
+
+    def advance(self, chunk=None, position=None):
+        """Hash `chunk` (just written at `position`) if it extends the hashed prefix, then catch up from disk."""
+        with self.lock:
+            if self.hashing:
+                return  # The hashing thread reads this chunk from disk when it gets there
+            if position != self.hashed:
+                chunk = None
+            if chunk is None and self._prefix_end() == self.hashed:
+                return
+            self.hashing = True
+
+        try:
+            if chunk is not None:
+                self._update(chunk)
+            while True:
+                with self.lock:
+                    prefix_end = self._prefix_end()
+                    if prefix_end == self.hashed:
+                        self.hashing = False
+                        return
+                self._hash_from_disk(prefix_end)
+        except BaseException:
+            with self.lock:
+                self.hashing = False
+            raise
+
+    def _prefix_end(self):
+        """End of the contiguous run of written bytes from the start of the file."""
+        end = 0
+        for start in sorted(self.segments):
+            segment_end, done = self.segments[start]
+            end = start + done
+            if end <= segment_end:
+                break
+        return end
+
+    def _hash_from_disk(self, until):
+        with open(self.part_path, "rb") as file:
+            file.seek(self.hashed)
+            while self.hashed < until:
+                data = file.read(min(1024 * 1024, until - self.hashed))
+                if not data:
+                    raise OSError(f"'{self.part_path}' is shorter than its recorded progress.")
+                self._update(data)
+
+    def _update(self, data):
+        for digest in self.digests.values():
+            digest.update(data)
+        self.hashed += len(data)
+
+def _probe_ranges(url, total_size):
+    """Ask for the first byte to check that the host serves ranges of the expected file."""
+    with download_get(url, headers={"Range": "bytes=0-0"}) as response:
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code != 206 or not content_range.endswith(f"/{total_size}"):
+            raise _RangeNotSupported()
+
+def _load_segments(part_path, total_size):
+    """Return the saved `{start: [end, bytes_done]}` progress of a segmented .part file, or None to start over."""
+    try:
+        with open(f"{part_path}.segments", "r") as f:
+            saved = json.load(f)
+        if saved["total_size"] == total_size and os.path.getsize(part_path) == total_size:
+            return {int(start): segment for start, segment in saved["segments"].items()}
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+def _save_segments(part_path, segments):
+    """Write the segment progress atomically, so an interrupted write never leaves a corrupt progress file."""
+    total_size = max(end for end, _ in segments.values()) + 1
+    temp_path = f"{part_path}.segments.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"total_size": total_size, "segments": segments}, f)
+    os.replace(temp_path, f"{part_path}.segments")
+
+def _remove_segmented_part(part_path):
+    _remove_file(part_path)
+    _remove_file(f"{part_path}.segments")
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def _validate_download(part_path, hashes, expected_size=None, expected_md5=None):
+    """Check a finished .part file against the size and MD5 reported by the API, discarding it on mismatch."""
+    actual_size = os.path.getsize(part_path)
+    if expected_size and actual_size != expected_size:
+        os.remove(part_path)
+        raise ValueError(f"Downloaded {actual_size} bytes, expected {expected_size}.")
+
+    if expected_md5 and hashes["md5"] != expected_md5.lower():
+        os.remove(part_path)
+        raise ValueError(f"MD5 mismatch: got {hashes['md5']}, expected {expected_md5}.")
+
 def _prepare_file_for_download(file_details: dict, mod_base_dir: str) -> tuple:
     """Prepare filename, download path, and directory for a single file."""
     file_name_base = file_details.get("name", f"file_{file_details.get('id', 'unknown')}")
@@ -1,5 +1,4 @@
 import os
-import json
 import re
 from typing import Dict, List
 import logging
@@ -7,48 +6,51 @@ from datetime import datetime
 from tkinter import messagebox, simpledialog
 
 from src.config import Config
+from src.storage import (
+    load_downloaded_files,
+    load_installed_files,
+    upsert_installed_file,
+    delete_installed_file,
+    find_installed_key,
+    is_version_downloaded,
+    load_tracked_mods,
+    save_tracked_mods,
+    list_installed_paths,
+    rename_installed_path,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def _load_download_cache() -> dict:
-    """Load the downloaded files JSON cache."""
-    if os.path.exists(Config.DOWNLOADED_FILES_CACHE):
-        with open(Config.DOWNLOADED_FILES_CACHE, "r") as cache_file:
-            return json.load(cache_file)
-    return {}
-
-def _save_download_cache(downloaded_files: dict):
-    """Save the updated cache data."""
-    try:
-        with open(Config.DOWNLOADED_FILES_CACHE, "w") as cache_file:
-            json.dump(downloaded_files, cache_file, indent=4)
-        logging.info(f"Cache successfully saved.")
-    except Exception as e:
-        logging.error(f"Error saving download cache: {e}")
+    """Load the downloaded files cache."""
+    return {"files": load_downloaded_files()}
 
 def _load_installed_files():
-    """Load the installed files tracking JSON."""
-    if os.path.exists(Config.INSTALLED_FILES_PATH):
-        with open(Config.INSTALLED_FILES_PATH, "r") as f:
-            return json.load(f)
-    return {}
+    """Load the installed files tracking data."""
+    return load_installed_files()
+
+def _track_installed_file(tracking_key, entry):
+    """Record a single installed mod without rewriting the rest of the tracking data."""
+    upsert_installed_file(tracking_key, entry)
 
-def _save_installed_files(installed_files):
-    """Save the installed files tracking JSON."""
-    with open(Config.INSTALLED_FILES_PATH, "w") as f:
-        json.dump(installed_files, f, indent=4)
+def _untrack_installed_file(tracking_key):
+    """Remove a single installed mod from the tracking data."""
+    delete_installed_file(tracking_key)
 
 def _load_tracked_mods_cache() -> List[Dict]:
     """Load the tracked mods from the cache."""
-    if os.path.exists(Config.CACHE_FILE):
-        try:
-            with open(Config.CACHE_FILE, "r") as cache_file:
-                return json.load(cache_file)
-        except Exception as e:
-            logging.error(f"Error loading tracked mods cache: {e}")
+    try:
+        return load_tracked_mods()
+    except Exception as e:
+        logging.error(f"Error loading tracked mods cache: {e}")
     return []
 
+def _save_tracked_mods_cache(mods: List[Dict]):
+    """Replace the tracked mods cache."""
+    save_tracked_mods(mods)
+    logging.info("Saved tracked mods to cache.")
+
 def _setup_mod_directory(mod_details: dict, output_dir: str) -> str:
     """Create and prepare the base directory structure for the mod."""
     mod_name = mod_details.get("name", f"Mod_{mod_details.get('id', 'unknown')}")
@@ -60,10 +62,12 @@ def _setup_mod_directory(mod_details: dict, output_dir: str) -> str:
 
     return mod_base_dir
 
-def _clean_directory(directory: str):
-    """Ensure the directory contains only the latest downloaded file."""
+def _clean_directory(directory: str, keep: str = None):
+    """Ensure the directory contains only the latest downloaded file (`keep`, when given)."""
     for existing_file in os.listdir(directory):
         path = os.path.join(directory, existing_file)
+        if keep and os.path.abspath(path) == os.path.abspath(keep):
+            continue
         try:
             if os.path.isfile(path):
                 os.remove(path)
@@ -71,48 +75,24 @@ def _clean_directory(directory: str):
         except Exception as e:
             logging.error(f"Error deleting file '{path}': {e}")
 
-def _find_matching_installed_file(file_name, installed_files):
+def _find_matching_installed_file(file_name):
     """
-    Search for a mod in installed_files, ignoring file extensions.
+    Check whether a mod is installed, ignoring file extensions.
     Example: If tracking says `mod.7z`, it should still find `mod.zip` or `mod.rar`.
+    Uses the base name index kept on the installed files state, so each lookup is O(1).
     """
-    base_name = file_name.rsplit(".", 1)[0]  # Remove extension
-    for stored_file in installed_files.keys():
-        stored_base = stored_file.rsplit(".", 1)[0]
-        if stored_base == base_name:
-            return True
-    return False
+    return find_installed_key(file_name) is not None
+
+def _is_version_downloaded(file_name, uploaded_timestamp):
+    """Check whether this exact version of a remote file is already in the download cache, in O(1)."""
+    return is_version_downloaded(file_name, uploaded_timestamp)
 
 def _list_installed_archives():
     """
-    Load the JSON file and return a sorted list of installed .archive files.
-    This function iterates over each mod's "extracted_files" and includes only those
-    whose filename ends with '.archive'. (Optionally, you can filter to ensure the file
-    is in the expected mod folder.)
+    Return a sorted list of installed .archive files.
+    The paths come from the in-memory installed files state, so nothing is read from disk or the database.
     """
-    json_path = Config.INSTALLED_FILES_PATH
-    if not os.path.exists(json_path):
-        return []
-
-    with open(json_path, "r") as f:
-        data = json.load(f)
-
-    archive_files = []
-    # Each key in the JSON represents an archive (zip/rar) upload,
-    # and the associated "extracted_files" list contains the installed file paths.
-    for mod_entry in data.values():
-        extracted_files = mod_entry.get("extracted_files", [])
-        for file_path in extracted_files:
-            # Only include files ending with ".archive"
-            if file_path.lower().endswith(".archive"):
-                # Optionally, check if the file is in the mod folder.
-                # For example, uncomment the following lines to filter by folder:
-                #
-                # if os.path.dirname(file_path).lower() != Config.ARCHIVE_FOLDER.lower():
-                #     continue
-                #
-                # We extract only the file name.
-                archive_files.append(os.path.basename(file_path))
+    archive_files = [os.path.basename(file_path) for file_path in list_installed_paths(".archive")]
 
     # Remove duplicates (if any) and sort case-insensitively.
     return sorted(set(archive_files), key=lambda x: x.lower())
@@ -120,8 +100,8 @@ def _list_installed_archives():
 def _rename_archive(tree):
     """
     Allow the user to rename a selected .archive file.
-    This renames the file on disk (using Config.ARCHIVE_FOLDER) and updates the JSON
-    file so that the new file name replaces the old one in the corresponding extracted_files.
+    This renames the file on disk (using Config.ARCHIVE_FOLDER) and updates the tracked
+    installed paths so that the new file name replaces the old one.
     """
     selected_item = tree.selection()
     if not selected_item:
@@ -149,36 +129,13 @@ def _rename_archive(tree):
         messagebox.showerror("Error", f"Failed to rename file on disk: {e}")
         return
 
-    # Now update the JSON file.
-    json_path = Config.INSTALLED_FILES_PATH
+    # Now update the tracked installed paths.
     try:
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        rename_installed_path(old_name, new_path)
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to load JSON file: {e}")
+        messagebox.showerror("Error", f"Failed to update installed files tracking: {e}")
         return
 
-    updated = False
-    # Search through each mod's extracted_files and update the matching entry.
-    for mod_entry in data.values():
-        updated_files = []
-        for file_path in mod_entry.get("extracted_files", []):
-            if os.path.basename(file_path) == old_name:
-                # Replace the file name with the new name but preserve the directory.
-                updated_files.append(os.path.join(Config.ARCHIVE_FOLDER, new_name))
-                updated = True
-            else:
-                updated_files.append(file_path)
-        mod_entry["extracted_files"] = updated_files
-
-    if updated:
-        try:
-            with open(json_path, "w") as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update JSON file: {e}")
-            return
-
     # Update the treeview to display the new file name.
     tree.item(selected_item, text=new_name)
     messagebox.showinfo("Success", "File renamed successfully.")
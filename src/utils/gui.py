@@ -5,6 +5,8 @@ from tkinter import ttk, messagebox
 import tkinter as tk
 from typing import Optional
 
+from src.storage import mod_file_states
+
 logger = logging.getLogger(__name__)
 
 
@@ -108,23 +110,18 @@ def _configure_treeview_tags(results_tree):
     # Enhanced separator with bold, italic text and gray background
     results_tree.tag_configure("separator", background="gray", foreground="lightgray", font=("Arial", 11, "bold italic"))
 
-def _compare_mod_status(mod_details, downloaded_files):
-    mod_name = mod_details.get("name", "Unknown")
-
-    # Check all files for the mod in `downloaded_files`
-    mod_files = [
-        file_metadata for file_metadata in downloaded_files.values()
-        if file_metadata.get("mod_name") == mod_name
-    ]
+def _compare_mod_status(mod_details):
+    """Determine a mod's download status from the mod_id index of downloaded files."""
+    # Up-to-date flag of every downloaded file of this mod
+    mod_files = mod_file_states(mod_details.get("mod_id"))
 
     if not mod_files:
         # If there are no files for this mod
         return "Not Downloaded"
 
     # Check if any file under the mod has matching timestamps
-    for file in mod_files:
-        if file["latest_downloaded_timestamp"] == file["latest_uploaded_timestamp"]:
-            return "Up-to-date"
+    if any(mod_files.values()):
+        return "Up-to-date"
 
     # If none of the files have matching timestamps, return "Update Available"
     return "Update Available"
@@ -150,7 +147,6 @@ def _update_progress_bar(progress_bar, progress_label, percent_complete, downloa
     progress_label.config(
         text=f"Downloaded {downloaded_mb:.2f} MB out of {total_mb:.2f} MB ({percent_complete:.2f}%)"
     )
-    progress_label.update_idletasks()
 
 def _get_selected_mod(results_tree: ttk.Treeview) -> Optional[tuple]:
     """Get the selected mod ID and name from the Treeview, ignoring category separators."""
@@ -1,5 +1,6 @@
 import os
 import shutil
+import tempfile
 import zipfile
 import logging
 from tkinter import messagebox
@@ -11,63 +12,137 @@ from src.config import Config
 logger = logging.getLogger(__name__)
 
 
-def _extract_zip(file_path, extract_to):
-    """Extracts a ZIP archive, ensuring the topmost folder is valid and handling `.archive` files correctly."""
-    temp_extraction_dir = os.path.join(extract_to, "_temp_extracted")
-    os.makedirs(temp_extraction_dir, exist_ok=True)
-
+def _plan_zip(file_path, extract_to):
+    """Builds the install manifest of a ZIP archive from its member list, without extracting anything."""
     with zipfile.ZipFile(file_path, "r") as zip_ref:
-        zip_ref.extractall(temp_extraction_dir)
-
-    _extract_common(temp_extraction_dir, extract_to, file_path)
-
-def _extract_rar(file_path, extract_to):
-    """Extracts a RAR archive while ensuring proper mod installation structure."""
-    temp_extraction_dir = os.path.join(extract_to, "_temp_extracted")
-    os.makedirs(temp_extraction_dir, exist_ok=True)
-
-    patoolib.extract_archive(file_path, outdir=temp_extraction_dir)
-
-    _extract_common(temp_extraction_dir, extract_to, file_path)
+        return _build_install_manifest(zip_ref.namelist(), extract_to, file_path)
+
+def _stream_zip_members(file_path, manifest, installed=None):
+    """
+    Decompresses the given ZIP members into their manifest destinations.
+    Every member is first written next to its destination and CRC-checked; the game files are only replaced
+    once the whole archive was read successfully, so a broken archive leaves the game directory untouched.
+    Each destination is appended to `installed` as soon as it is in place.
+    """
+    staged = []
+    try:
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            for member, destination in manifest.items():
+                staged.append((_stream_zip_member(zip_ref, member, destination), destination))
+    except Exception:
+        for temp_path, _ in staged:
+            _remove_temp_file(temp_path)
+        raise
+
+    for temp_path, destination in staged:
+        os.replace(temp_path, destination)
+        if installed is not None:
+            installed.append(destination)
+    return [destination for _, destination in staged]
+
+def _stream_zip_member(zip_ref, member, destination):
+    """Decompresses a single ZIP member into a temporary file next to its destination and returns its path."""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temp_path = f"{destination}.installing"
+    try:
+        # Reading the member to the end makes zipfile check its CRC
+        with zip_ref.open(member) as source, open(temp_path, "wb") as target:
+            shutil.copyfileobj(source, target, length=1024 * 1024)  # 1 MB chunks
+    except Exception:
+        _remove_temp_file(temp_path)
+        raise
+    return temp_path
+
+def _remove_temp_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def _stage_rar(file_path, extract_to):
+    """Unpacks a RAR archive into its own staging directory and builds its install manifest."""
+    temp_extraction_dir = tempfile.mkdtemp(prefix="_temp_extracted_", dir=extract_to)
+    try:
+        patoolib.extract_archive(file_path, outdir=temp_extraction_dir)
+        return temp_extraction_dir, _extract_common(temp_extraction_dir, extract_to, file_path)
+    except Exception:
+        _cleanup_temp_extraction(temp_extraction_dir)
+        raise
 
 def _extract_common(temp_extraction_dir, extract_to, file_path):
-    """Handles the extraction logic for both ZIP and RAR archives."""
-    extracted_files = _list_files_recursive(temp_extraction_dir)
-
-    if _handle_only_archive_files(temp_extraction_dir, extracted_files, file_path):
-        _cleanup_temp_extraction(temp_extraction_dir)
-        return
+    """Builds the install manifest for an archive that was fully unpacked into a staging directory."""
+    members = [
+        os.path.relpath(path, temp_extraction_dir).replace(os.sep, "/")
+        for path in _list_files_recursive(temp_extraction_dir)
+    ]
+    return _build_install_manifest(members, extract_to, file_path)
+
+def _build_install_manifest(members, extract_to, file_path):
+    """
+    Map archive member paths to their final install paths.
+    The mapping follows the same rules as the extraction itself, so the result doubles
+    as the list of files the archive installs and no directory walk is needed to track them.
+    """
+    files = [m.replace("\\", "/") for m in members if not m.endswith(("/", "\\"))]
+    files = [f for f in files if _is_safe_member(f)]
+    original_names = {m.replace("\\", "/"): m for m in members}
+
+    if files and all(f.endswith(".archive") for f in files):
+        logging.info(f"📂 Only .archive files detected in '{file_path}'. Extracting to {Config.ARCHIVE_FOLDER}...")
+        return {original_names[f]: os.path.join(Config.ARCHIVE_FOLDER, f.rsplit("/", 1)[-1]) for f in files}
 
-    temp_extraction_dir = _find_deepest_valid_folder(temp_extraction_dir)
-    folder_structure, mod_folders_present = _get_folder_structure_and_mod_presence(extracted_files)
+    root = _find_deepest_valid_folder(files)
+    relative_members = {original_names[f]: f[len(root):] for f in files if f.startswith(root)}
+    folder_structure, mod_folders_present = _get_folder_structure_and_mod_presence(relative_members.values())
 
     if not folder_structure:
-        _log_and_cleanup(f"No valid root folders found in '{file_path}'. Skipping extraction.", temp_extraction_dir)
+        logging.warning(f"No valid root folders found in '{file_path}'. Skipping extraction.")
+        return {}
+
+    if mod_folders_present:
+        return _move_relevant_folders(relative_members, extract_to)
+
+    # Mod folders may sit one level below a wrapper folder named after the mod
+    for topmost_root_folder in sorted(folder_structure):
+        nested_members = {
+            member: relative.split("/", 1)[1]
+            for member, relative in relative_members.items()
+            if relative.startswith(f"{topmost_root_folder}/")
+        }
+        manifest = _move_relevant_folders(nested_members, extract_to)
+        if manifest:
+            return manifest
+
+    logging.warning(f"Unrecognized folder structure in '{file_path}'. Extracting normally.")
+    return {member: os.path.join(extract_to, *relative.split("/")) for member, relative in relative_members.items()}
+
+def _is_safe_member(member):
+    """Rejects absolute member paths and paths that would escape the install directory."""
+    parts = member.split("/")
+    if member.startswith("/") or ":" in parts[0] or ".." in parts:
+        logging.warning(f"Skipping unsafe archive member: {member}")
+        return False
+    return True
+
+def _install_from_staging(temp_extraction_dir, manifest, installed=None):
+    """
+    Moves staged files to their manifest destinations and returns the installed paths.
+    Each destination is appended to `installed` as soon as it is in place.
+    """
+    installed_files = []
+    try:
+        for member, destination in manifest.items():
+            staged_path = os.path.join(temp_extraction_dir, *member.replace("\\", "/").split("/"))
+            if not os.path.isfile(staged_path):
+                continue
+
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.move(staged_path, destination)
+            installed_files.append(destination)
+            if installed is not None:
+                installed.append(destination)
+    finally:
         _cleanup_temp_extraction(temp_extraction_dir)
-        return
-
-    _process_extracted_structure(temp_extraction_dir, extract_to, file_path, folder_structure, mod_folders_present)
-    _cleanup_temp_extraction(temp_extraction_dir)
-
-def _handle_only_archive_files(temp_extraction_dir, extracted_files, file_path):
-    """Handles cases where only .archive files are extracted."""
-    if all(f.endswith(".archive") for f in extracted_files):
-        logging.info(f"📂 Only .archive files detected in '{file_path}'. Extracting to {Config.ARCHIVE_FOLDER}...")
-
-        if not os.path.exists(Config.ARCHIVE_FOLDER):
-            os.makedirs(Config.ARCHIVE_FOLDER, exist_ok=True)
-
-        for file in extracted_files:
-            shutil.move(os.path.join(temp_extraction_dir, file), Config.ARCHIVE_FOLDER)
 
-        logging.info(f"Extracted .archive files to {Config.ARCHIVE_FOLDER}")
-
-
-        ### THIS IS NOT REACHED FOR SOME REASON?
-        _cleanup_temp_extraction(temp_extraction_dir)
-        logging.info(f"✅ Successfully deleted temporary extraction directory: {temp_extraction_dir}")
-        return True
-    return False
+    return installed_files
 
 def _cleanup_temp_extraction(temp_extraction_dir):
     """Ensures the temporary extraction directory is removed after processing."""
@@ -75,83 +150,49 @@ def _cleanup_temp_extraction(temp_extraction_dir):
         shutil.rmtree(temp_extraction_dir)
         logging.info(f"✅ Cleaned up temporary extraction directory: {temp_extraction_dir}")
 
-def _get_folder_structure_and_mod_presence(extracted_files):
+def _get_folder_structure_and_mod_presence(relative_paths):
     """Determines the folder structure and checks for mod folders."""
-    folder_structure = {os.path.normpath(f).split(os.sep)[0] for f in extracted_files if os.sep in f}
+    folder_structure = {path.split("/", 1)[0] for path in relative_paths if "/" in path}
     mod_folders_present = Config.MOD_FOLDERS.intersection(folder_structure)
     return folder_structure, mod_folders_present
 
-def _process_extracted_structure(temp_extraction_dir, extract_to, file_path, folder_structure, mod_folders_present):
-    """Processes the extracted folder structure and moves files accordingly."""
-    topmost_root_folder = sorted(folder_structure)[0]
-
-    if topmost_root_folder not in Config.MOD_FOLDERS:
-        extracted_mod_dir = os.path.join(temp_extraction_dir, topmost_root_folder)
-        if os.path.exists(extracted_mod_dir):
-            _move_relevant_folders(extracted_mod_dir, extract_to)
-            shutil.rmtree(temp_extraction_dir)  # Cleanup temp extraction
-        else:
-            logging.warning(f"Unexpected structure in {file_path}. Extracting normally.")
-            shutil.move(temp_extraction_dir, extract_to)
-    elif mod_folders_present:
-        _move_relevant_folders(temp_extraction_dir, extract_to)
-        shutil.rmtree(temp_extraction_dir)  # Cleanup temp extraction
-    else:
-        logging.warning(f"Unrecognized folder structure in '{file_path}'. Extracting normally.")
-        shutil.move(temp_extraction_dir, extract_to)
-
-def _log_and_cleanup(message, temp_extraction_dir):
-    """Logs a warning message and removes the temporary extraction directory."""
-    logging.warning(message)
-    shutil.rmtree(temp_extraction_dir)
-
-def _find_deepest_valid_folder(temp_extraction_dir):
-    """Finds the deepest folder containing mod files inside the extracted directory."""
-    current_dir = temp_extraction_dir
+def _find_deepest_valid_folder(files):
+    """Finds the deepest folder prefix containing mod folders among the archive's member paths."""
+    prefix = ""
     while True:
-        subdirs = [d for d in os.listdir(current_dir) if os.path.isdir(os.path.join(current_dir, d))]
+        subdirs = {
+            path[len(prefix):].split("/", 1)[0]
+            for path in files
+            if path.startswith(prefix) and "/" in path[len(prefix):]
+        }
 
-        # If we found standard mod folders, return the current directory
-        if any(folder in subdirs for folder in Config.MOD_FOLDERS):
-            return current_dir
+        # If we found standard mod folders, return the current prefix
+        if Config.MOD_FOLDERS.intersection(subdirs):
+            return prefix
 
         # If there's only one folder inside, go deeper
         if len(subdirs) == 1:
-            current_dir = os.path.join(current_dir, subdirs[0])
+            prefix += f"{subdirs.pop()}/"
         else:
             break  # Stop if we can't drill down further
 
-    return temp_extraction_dir  # Return the best guess if nothing valid is found
-
-def _move_relevant_folders(src_dir, dest_dir):
-    """Moves only the relevant mod folders (e.g., `archive`, `bin`) from a nested extraction to the correct location."""
-    for folder in os.listdir(src_dir):
-        folder_path = os.path.join(src_dir, folder)
-
-        if folder in Config.MOD_FOLDERS and os.path.isdir(folder_path):
-            dest_path = os.path.join(dest_dir, folder)
+    return ""  # Return the archive root if nothing valid is found
 
-            if not os.path.exists(dest_path):
-                os.makedirs(dest_path)  # Create destination if it doesn't exist
+def _move_relevant_folders(relative_members, dest_dir):
+    """Maps only the relevant mod folders (e.g., `archive`, `bin`) to their location inside the game directory."""
+    manifest = {}
+    skipped_folders = set()
+    for member, relative in relative_members.items():
+        folder = relative.split("/", 1)[0]
 
-            for root, _, files in os.walk(folder_path):
-                relative_path = os.path.relpath(root, folder_path)
-                target_dir = os.path.join(dest_path, relative_path)
-
-                if not os.path.exists(target_dir):
-                    os.makedirs(target_dir)
-
-                for file in files:
-                    src_file = os.path.join(root, file)
-                    dest_file = os.path.join(target_dir, file)
-
-                    shutil.move(src_file, dest_file)
-
-            shutil.rmtree(folder_path)
-
-        elif os.path.isdir(folder_path):
+        if folder in Config.MOD_FOLDERS and "/" in relative:
+            manifest[member] = os.path.join(dest_dir, *relative.split("/"))
+        elif "/" in relative and folder not in skipped_folders:
+            skipped_folders.add(folder)
             logging.info(f"Skipping non-mod folder '{folder}'")
 
+    return manifest
+
 def _list_files_recursive(directory):
     """Recursively list all files inside a directory, ignoring folders."""
     all_files = []
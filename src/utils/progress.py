@@ -0,0 +1,60 @@
+import logging
+import threading
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Progress events waiting for the Tk thread: topic -> list of (args, final) in publishing order
+_pending = {}
+_subscribers = {}
+_lock = threading.Lock()
+
+
+def publish_progress(topic, *args, final=False):
+    """
+    Publish a progress event from any thread; subscribers of `topic` receive `args` on the Tk thread.
+    Events published faster than the UI refresh rate are coalesced so only the latest one is delivered,
+    except `final` events (e.g. a batch finishing), which are always delivered in order.
+    """
+    with _lock:
+        events = _pending.setdefault(topic, [])
+        if events and not events[-1][1]:
+            events[-1] = (args, final)
+        else:
+            events.append((args, final))
+
+def subscribe_progress(topic, callback):
+    """Call `callback(*args)` on the Tk thread for the events published to `topic`."""
+    with _lock:
+        _subscribers.setdefault(topic, []).append(callback)
+
+def unsubscribe_progress(topic, callback):
+    with _lock:
+        callbacks = _subscribers.get(topic, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            _subscribers.pop(topic, None)
+
+def start_progress_pump(root):
+    """Deliver published progress events on the Tk thread, `Config.PROGRESS_REFRESH_MS` apart."""
+    def pump():
+        _drain()
+        root.after(Config.PROGRESS_REFRESH_MS, pump)
+
+    root.after(Config.PROGRESS_REFRESH_MS, pump)
+
+def _drain():
+    with _lock:
+        pending = list(_pending.items())
+        _pending.clear()
+        subscribers = {topic: list(callbacks) for topic, callbacks in _subscribers.items()}
+
+    for topic, events in pending:
+        for args, _ in events:
+            for callback in subscribers.get(topic, []):
+                try:
+                    callback(*args)
+                except Exception as e:
+                    logging.error(f"Progress subscriber for '{topic}' failed: {e}")
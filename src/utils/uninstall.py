@@ -4,6 +4,8 @@ import ctypes
 import logging
 from tkinter import messagebox
 
+from src.storage import find_installed_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,14 +27,9 @@ def _remove_file_safely(file_path):
             logging.error(f"Could not remove {file_path}: {e}")
 
 
-def _find_matching_mod(file_name, installed_files):
+def _find_matching_mod(file_name):
     """
-    Search for a mod in installed_files, ignoring file extensions.
+    Return the tracking key of an installed mod, ignoring file extensions.
     Example: If tracking says `mod.7z`, it should still find `mod.zip` or `mod.rar`.
     """
-    base_name = file_name.rsplit(".", 1)[0]  # Remove extension
-    for stored_file in installed_files.keys():
-        stored_base = stored_file.rsplit(".", 1)[0]
-        if stored_base == base_name:
-            return stored_file
-    return None
+    return find_installed_key(file_name)